@@ -1,30 +1,61 @@
 import os
-import requests
-import json
 
 from dotenv import load_dotenv
+from llm_gateway import chat_completion, extract_json
 
 load_dotenv()
 
+# Answers per prompt in batch evaluation (keeps each reply well inside output limits)
+BATCH_EVAL_CHUNK_SIZE = int(os.getenv("BATCH_EVAL_CHUNK_SIZE", "6"))
+
+def is_empty_answer(answer: str) -> bool:
+    return not answer or not answer.strip() or answer.strip() in ["Transcribing...", "Your speech will appear here automatically..."]
+
+def empty_answer_result():
+    return {
+        "corrected_answer": "No answer provided.",
+        "grammar_score": 0,
+        "relevance_score": 0,
+        "clarity_score": 0,
+        "overall_score": 0,
+        "feedback": "Please record your answer before analyzing."
+    }
+
+def missing_key_result():
+    return {
+        "corrected_answer": "Error: Missing API Key",
+        "overall_score": 0,
+        "feedback": "Server configuration error: OpenRouter API Key is missing."
+    }
+
+def offline_result(answer: str):
+    # FALLBACK: Heuristic Scoring (Offline Mode)
+    word_count = len(answer.split())
+    score = min(max(word_count * 2, 40), 85)
+    return {
+        "corrected_answer": "Analysis unavailable (Offline Mode)",
+        "overall_score": score,
+        "feedback": f"⚠️ API Quota/Error (Offline Mode). Your answer was recorded ({word_count} words). To get real AI analysis, check API credits.",
+        "keywords": ["Offline"]
+    }
+
+def apply_short_answer_guard(answer: str, result: dict) -> dict:
+    # Safety Check: If answer is too short (< 15 words) and score is high, force it down.
+    # This prevents the AI from scoring its own "Suggested Answer" or giving credit for empty greetings.
+    if len(answer.split()) < 15 and result.get("overall_score", 0) > 40:
+        result["overall_score"] = 10
+        if "too short" not in result.get("feedback", "").lower():
+             result["feedback"] = "Your answer was too short to be evaluated properly. Please provide a more detailed response. " + result.get("feedback", "")
+    return result
+
 def analyze_answer(question: str, answer: str, context: str = ""):
     # Short-circuit for empty/placeholder answers
-    if not answer or not answer.strip() or answer.strip() in ["Transcribing...", "Your speech will appear here automatically..."]:
-        return {
-            "corrected_answer": "No answer provided.",
-            "grammar_score": 0,
-            "relevance_score": 0,
-            "clarity_score": 0,
-            "overall_score": 0,
-            "feedback": "Please record your answer before analyzing."
-        }
+    if is_empty_answer(answer):
+        return empty_answer_result()
 
     api_key = os.getenv("OPENROUTER_API_KEY")
     if not api_key:
-        return {
-            "corrected_answer": "Error: Missing API Key",
-            "overall_score": 0,
-            "feedback": "Server configuration error: OpenRouter API Key is missing."
-        }
+        return missing_key_result()
     prompt = f"""
 You are an expert interview coach and evaluator. Your task is to provide high-quality, personalized feedback to a candidate.
 
@@ -69,59 +100,92 @@ Format:
 """
 
     try:
-        response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "openai/gpt-4o-mini",
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0
-            },
-            timeout=30
-        )
-
-        if response.status_code == 402:
-            raise Exception("API Quota Exceeded (402)")
-        
-        if response.status_code != 200:
-             raise Exception(f"API Error {response.status_code}")
-
-        data = response.json()
-        
-        if "choices" not in data:
-            raise Exception("Invalid API structure")
-
-        content = data["choices"][0]["message"]["content"]
-        
-        start = content.find("{")
-        end = content.rfind("}") + 1
-        if start == -1 or end == 0:
-             raise Exception("No JSON found")
-
-        result = json.loads(content[start:end])
-
-        # Safety Check: If answer is too short (< 15 words) and score is high, force it down.
-        # This prevents the AI from scoring its own "Suggested Answer" or giving credit for empty greetings.
-        if len(answer.split()) < 15 and result.get("overall_score", 0) > 40:
-            result["overall_score"] = 10
-            if "too short" not in result.get("feedback", "").lower():
-                 result["feedback"] = "Your answer was too short to be evaluated properly. Please provide a more detailed response. " + result.get("feedback", "")
-        
-        return result
+        content = chat_completion(prompt, model="openai/gpt-4o-mini", temperature=0)
+        result = extract_json(content)
+        return apply_short_answer_guard(answer, result)
 
     except Exception as e:
         print(f"⚠️ Analysis API Failed: {e}")
-        # FALLBACK: Heuristic Scoring (Offline Mode)
-        word_count = len(answer.split())
-        score = min(max(word_count * 2, 40), 85)
-        return {
-            "corrected_answer": "Analysis unavailable (Offline Mode)",
-            "overall_score": score,
-            "feedback": f"⚠️ API Quota/Error (Offline Mode). Your answer was recorded ({word_count} words). To get real AI analysis, check API credits.",
-            "keywords": ["Offline"]
-        }
+        return offline_result(answer)
+
+def _analyze_chunk(pairs, context: str):
+    """One prompt for several (question, answer) pairs -> list of results in order."""
+    numbered = "\n\n".join(
+        f'[{i}] Question: "{question}"\n    Candidate\'s Answer: "{answer}"'
+        for i, (question, answer) in enumerate(pairs, start=1)
+    )
+    prompt = f"""
+You are an expert interview coach and evaluator. Evaluate EACH of the candidate's answers below and give high-quality, personalized feedback.
+
+Context (Resume/Job Description):
+{context}
+
+Rules (apply to every answer independently):
+1. Score ONLY what the candidate actually said (0-100), never their potential or resume. If an answer is "hello", "I don't know", or very short/irrelevant, its score MUST be < 30.
+2. corrected_answer: polish a good answer. If it is poor or missing, write a FULL MODEL ANSWER based on the Context, starting with "Suggested Answer:". Do NOT score your own suggested answer.
+3. feedback: be honest; critique content, delivery (implied by text) and structure.
+4. keywords: key concepts from the suggested answer.
+
+Answers to evaluate:
+{numbered}
+
+Return VALID JSON ONLY, one entry per answer, using the same index numbers:
+{{
+  "results": [
+    {{
+      "index": 1,
+      "corrected_answer": "Suggested Answer: ...",
+      "grammar_score": 0,
+      "relevance_score": 0,
+      "clarity_score": 0,
+      "overall_score": 0,
+      "feedback": "Feedback...",
+      "keywords": ["key1", "key2"]
+    }}
+  ]
+}}
+"""
+    try:
+        content = chat_completion(prompt, model="openai/gpt-4o-mini", temperature=0)
+        by_index = {int(r.get("index", 0)): r for r in extract_json(content).get("results", [])}
+    except Exception as e:
+        print(f"⚠️ Batch Analysis API Failed: {e}")
+        by_index = {}
+
+    results = []
+    for i, (question, answer) in enumerate(pairs, start=1):
+        result = by_index.get(i)
+        if result is None:
+            # Missing from the reply (or the call failed): heuristic score for this one
+            results.append(offline_result(answer))
+            continue
+        result.pop("index", None)
+        results.append(apply_short_answer_guard(answer, result))
+    return results
+
+def analyze_answers_batch(pairs, context: str = ""):
+    """Evaluate a whole interview's (question, answer) pairs in a few chunked prompts.
+
+    The shared context and instructions are sent once per chunk instead of
+    once per answer. Returns one result dict per pair, in order.
+    """
+    if not os.getenv("OPENROUTER_API_KEY"):
+        return [empty_answer_result() if is_empty_answer(a) else missing_key_result() for _, a in pairs]
+
+    results = [None] * len(pairs)
+    to_score = []
+    for i, (question, answer) in enumerate(pairs):
+        if is_empty_answer(answer):
+            results[i] = empty_answer_result()
+        else:
+            to_score.append(i)
+
+    for start in range(0, len(to_score), BATCH_EVAL_CHUNK_SIZE):
+        chunk = to_score[start:start + BATCH_EVAL_CHUNK_SIZE]
+        chunk_results = _analyze_chunk([pairs[i] for i in chunk], context)
+        for i, result in zip(chunk, chunk_results):
+            results[i] = result
+
+    return results
 
 print("✅ evaluate_answer.py loaded")
@@ -0,0 +1,91 @@
+import os
+import asyncio
+
+# 🔹 Decode uploaded audio/video straight through an ffmpeg pipe into the
+# 16 kHz mono float32 array Whisper expects. Nothing touches the disk, so
+# there is no temp file to leak when decoding or transcription fails.
+SAMPLE_RATE = 16000
+CHUNK_SIZE = 64 * 1024
+
+# One-shot decodes are CPU-heavy too; cap how many ffmpeg processes run at once
+FFMPEG_CONCURRENCY = int(os.getenv("FFMPEG_CONCURRENCY", str(max(2, os.cpu_count() or 2))))
+ffmpeg_slots = asyncio.Semaphore(FFMPEG_CONCURRENCY)
+
+
+class AudioDecodeError(Exception):
+    pass
+
+
+def ffmpeg_pcm_command(sample_rate: int = SAMPLE_RATE):
+    return [
+        "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-vn", "-ac", "1", "-ar", str(sample_rate),
+        "-f", "s16le", "-acodec", "pcm_s16le",
+        "pipe:1"
+    ]
+
+
+def pcm_to_float32(pcm: bytes):
+    import numpy as np
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+async def spawn_ffmpeg(sample_rate: int = SAMPLE_RATE):
+    try:
+        return await asyncio.create_subprocess_exec(
+            *ffmpeg_pcm_command(sample_rate),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except FileNotFoundError:
+        raise AudioDecodeError("ffmpeg is not installed")
+
+
+def decoded(returncode: int, pcm: bytes, stderr: bytes):
+    if returncode != 0:
+        raise AudioDecodeError(stderr.decode(errors="ignore").strip()[-300:] or "ffmpeg failed to decode audio")
+    if not pcm:
+        raise AudioDecodeError("No audio stream found")
+    return pcm_to_float32(pcm)
+
+
+async def decode_stream(upload, sample_rate: int = SAMPLE_RATE):
+    """Pipe an UploadFile (or anything with an async read(n)) through ffmpeg.
+
+    Upload chunks are written to ffmpeg's stdin while its stdout is drained
+    concurrently, so neither side of the pipe can fill up and deadlock.
+    """
+    async with ffmpeg_slots:
+        return await _decode_stream(upload, sample_rate)
+
+
+async def _decode_stream(upload, sample_rate: int):
+    process = await spawn_ffmpeg(sample_rate)
+
+    async def feed():
+        try:
+            while True:
+                chunk = await upload.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg exited early; its stderr says why
+        finally:
+            process.stdin.close()
+
+    _, pcm, stderr = await asyncio.gather(feed(), process.stdout.read(), process.stderr.read())
+    await process.wait()
+
+    return decoded(process.returncode, pcm, stderr)
+
+
+async def decode_bytes(data: bytes, sample_rate: int = SAMPLE_RATE):
+    """Same as decode_stream, for audio already held in memory."""
+    async with ffmpeg_slots:
+        process = await spawn_ffmpeg(sample_rate)
+        pcm, stderr = await process.communicate(data)
+    return decoded(process.returncode, pcm, stderr)
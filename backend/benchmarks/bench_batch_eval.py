@@ -0,0 +1,58 @@
+"""Per-answer scoring vs. end-of-interview batch evaluation.
+
+Scores the same 12-answer interview both ways against a fake LLM whose
+latency grows with prompt size, and reports LLM calls, prompt tokens
+(~4 chars/token) and wall time.
+
+    cd backend && python benchmarks/bench_batch_eval.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import prepare_sandbox, install_fake_llm, SAMPLE_RESUME
+
+QUESTIONS = 12
+BASE_LATENCY = 0.4
+LATENCY_PER_1K_TOKENS = 0.15
+
+
+def main():
+    prepare_sandbox()
+    fake = install_fake_llm(BASE_LATENCY, LATENCY_PER_1K_TOKENS)
+    from analyze_answer import analyze_answer, analyze_answers_batch
+
+    # Same raw-profile context the routes built for every answer
+    context = f"Candidate's resume: {SAMPLE_RESUME[:5000]}"
+    pairs = [
+        (
+            f"Question {i}: describe how you used Python and SQL in a recent project?",
+            "In my last role I built a FastAPI service backed by PostgreSQL, wrote the data "
+            "access layer, added caching and tests, and cut p95 latency roughly in half. " * 2
+        )
+        for i in range(1, QUESTIONS + 1)
+    ]
+
+    rows = []
+    for label, run in (
+        ("per-answer", lambda: [analyze_answer(q, a, context) for q, a in pairs]),
+        ("batch", lambda: analyze_answers_batch(pairs, context)),
+    ):
+        fake.calls = fake.prompt_chars = 0
+        start = time.perf_counter()
+        results = run()
+        wall = time.perf_counter() - start
+        assert len(results) == QUESTIONS
+        rows.append((label, fake.calls, fake.prompt_chars // 4, wall))
+
+    print(f"{QUESTIONS} answers, {len(context)}-char context, fake LLM {BASE_LATENCY}s + {LATENCY_PER_1K_TOKENS}s/1k prompt tokens\n")
+    print(f"{'mode':<12}{'LLM calls':>10}{'prompt tokens':>16}{'wall time':>12}")
+    for label, calls, tokens, wall in rows:
+        print(f"{label:<12}{calls:>10}{tokens:>16}{wall:>11.2f}s")
+    base, batch = rows
+    print(f"\nbatch uses {base[2] / batch[2]:.1f}x fewer prompt tokens and is {base[3] / batch[3]:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Prompt size with the raw profile text vs. the compact profile digest.
+
+Builds the evaluation context both ways for a ~5000-char resume and scores
+the same answers with each, reporting prompt tokens (~4 chars/token) and
+wall time against a fake LLM whose latency grows with prompt size.
+
+    cd backend && python benchmarks/bench_context_digest.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import prepare_sandbox, install_fake_llm, estimate_tokens, SAMPLE_RESUME
+
+ANSWERS = 10
+BASE_LATENCY = 0.3
+LATENCY_PER_1K_TOKENS = 0.15
+
+
+def main():
+    prepare_sandbox()
+    fake = install_fake_llm(BASE_LATENCY, LATENCY_PER_1K_TOKENS)
+    import uploded
+    from analyze_answer import analyze_answer
+
+    profile_text = SAMPLE_RESUME[:5000]
+    raw_context = f"Candidate's resume: {profile_text}"
+    digests = {
+        "digest (LLM analysis)": uploded.build_profile_digest(profile_text, uploded.analyze_resume_or_jd(profile_text), "resume"),
+        "digest (offline)": uploded.build_profile_digest(profile_text, None, "resume"),
+    }
+
+    print(f"{'context':<24}{'chars':>8}{'tokens':>8}")
+    print(f"{'raw profile text':<24}{len(raw_context):>8}{estimate_tokens(raw_context):>8}")
+    for label, digest in digests.items():
+        context = f"Candidate profile digest:\n{digest}"
+        print(f"{label:<24}{len(context):>8}{estimate_tokens(context):>8}")
+
+    answer = "I designed the ledger APIs in FastAPI with PostgreSQL and added Redis caching. " * 3
+    print(f"\nScoring {ANSWERS} answers (fake LLM {BASE_LATENCY}s + {LATENCY_PER_1K_TOKENS}s/1k prompt tokens)")
+    print(f"{'context':<24}{'prompt tokens':>14}{'wall time':>12}")
+    rows = []
+    for label, context in (
+        ("raw profile text", raw_context),
+        ("digest (LLM analysis)", f"Candidate profile digest:\n{digests['digest (LLM analysis)']}"),
+    ):
+        fake.prompt_chars = 0
+        start = time.perf_counter()
+        for i in range(ANSWERS):
+            analyze_answer(f"Question {i}: tell us about your backend work?", answer, context)
+        wall = time.perf_counter() - start
+        rows.append((fake.prompt_chars // 4, wall))
+        print(f"{label:<24}{fake.prompt_chars // 4:>14}{wall:>11.2f}s")
+
+    print(f"\ndigest cuts prompt tokens {rows[0][0] / rows[1][0]:.1f}x and per-answer latency {rows[0][1] / rows[1][1]:.1f}x")
+    print("\nDigest:\n" + digests["digest (LLM analysis)"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Reader latency while answers are being inserted.
+
+READERS threads keep fetching an interview's answers (the report query) while
+one writer thread upserts answers as fast as it can, the way concurrent
+/save-answer calls do. "shared" is the old setup: one connection shared by
+every thread (serialized with a lock so it doesn't corrupt results) and the
+default rollback journal. "wal" goes through database.py: one connection per
+thread in WAL mode, so readers don't queue behind the writer's commits.
+
+    cd backend && python benchmarks/bench_db_concurrency.py [--seconds 5 --readers 8]
+"""
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import prepare_sandbox, describe
+
+SEED_INTERVIEWS = 200
+QUESTIONS_PER_INTERVIEW = 10
+READ_INTERVAL = 0.002  # readers are requests, not a hot loop
+REPORT_QUERY = """
+    SELECT question_text, answer_text, ai_score, ai_feedback, corrected_answer
+    FROM answers WHERE interview_id = ? ORDER BY question_id ASC
+"""
+UPSERT = """
+    INSERT INTO answers (interview_id, question_id, question_text, answer_text, scoring_status, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(interview_id, question_id) DO UPDATE SET answer_text = excluded.answer_text
+"""
+
+
+def seed(run_in_transaction):
+    rows = [
+        (f"seed-{i}", q, f"Question {q}?", "A reasonably long answer about distributed systems. " * 10, "pending", "now")
+        for i in range(SEED_INTERVIEWS) for q in range(QUESTIONS_PER_INTERVIEW)
+    ]
+    run_in_transaction(lambda db: db.executemany(UPSERT, rows))
+
+
+class SharedConnection:
+    """The pre-pool database.py: one connection, one lock, rollback journal."""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE answers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, interview_id TEXT, question_id INTEGER,
+                question_text TEXT, answer_text TEXT, ai_score INTEGER, ai_feedback TEXT,
+                corrected_answer TEXT, scoring_status TEXT, created_at TEXT
+            )
+        """)
+        self.conn.execute("CREATE UNIQUE INDEX idx_answers_interview_question ON answers(interview_id, question_id)")
+        self.lock = threading.Lock()
+
+    def read(self, interview_id):
+        with self.lock:
+            return self.conn.execute(REPORT_QUERY, (interview_id,)).fetchall()
+
+    def write(self, fn):
+        with self.lock:
+            fn(self.conn)
+            self.conn.commit()
+
+
+class PooledConnections:
+    """database.py as it is now."""
+
+    def __init__(self):
+        import database
+        self.database = database
+
+    def read(self, interview_id):
+        return self.database.query_all(REPORT_QUERY, (interview_id,))
+
+    def write(self, fn):
+        with self.database.transaction() as db:
+            fn(db)
+
+
+def run(store, seconds: float, readers: int):
+    seed(store.write)
+    stop = threading.Event()
+    latencies = [[] for _ in range(readers)]
+    writes = [0]
+
+    def reader(slot):
+        i = slot
+        while not stop.is_set():
+            started = time.perf_counter()
+            store.read(f"seed-{i % SEED_INTERVIEWS}")
+            latencies[slot].append((time.perf_counter() - started) * 1000)
+            i += readers
+            time.sleep(READ_INTERVAL)
+
+    def writer():
+        n = 0
+        while not stop.is_set():
+            answer = ("live", n, "Tell me about a project.", "An answer being saved. " * 20, "pending", "now")
+            store.write(lambda db: (
+                db.execute(UPSERT, answer),
+                db.execute("SELECT id FROM answers WHERE interview_id = ? AND question_id = ?", ("live", n)).fetchone()
+            ))
+            n += 1
+        writes[0] = n
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    samples = [ms for per_reader in latencies for ms in per_reader]
+    return samples, writes[0]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args()
+
+    prepare_sandbox()
+    for label in ("shared", "wal"):
+        store = SharedConnection("shared.db") if label == "shared" else PooledConnections()
+        samples, writes = run(store, args.seconds, args.readers)
+        print(describe(f"{label:<7} reads={len(samples) / args.seconds:7.0f}/s writes={writes / args.seconds:5.0f}/s", samples))
+
+
+if __name__ == "__main__":
+    main()
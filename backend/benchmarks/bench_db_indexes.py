@@ -0,0 +1,92 @@
+"""Report and summary query cost before and after the index migrations.
+
+Seeds a throw-away database with ANSWERS answers spread over interviews
+(QUESTIONS each) using only the base schema (migration 001, i.e. what the app
+used to create: no indexes), times the hot per-interview queries, then applies
+the remaining migrations and times them again. Query plans are printed so the
+switch from SCAN to SEARCH ... USING INDEX is visible.
+
+    cd backend && python benchmarks/bench_db_indexes.py [--answers 1000000 --questions 20]
+"""
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import prepare_sandbox, describe
+
+QUERIES = {
+    "report": """
+        SELECT question_text, answer_text, ai_score, ai_feedback, corrected_answer
+        FROM answers WHERE interview_id = ? ORDER BY question_id ASC
+    """,
+    "ai-summary": "SELECT ai_score FROM answers WHERE interview_id = ? AND ai_score IS NOT NULL",
+    "by-candidate": "SELECT id FROM interviews WHERE candidate_id = ?",
+}
+
+
+def seed(db, answers: int, questions: int):
+    interviews = answers // questions
+    db.executemany(
+        "INSERT INTO interviews (id, candidate_id, source, created_at) VALUES (?, ?, 'resume', 'now')",
+        ((f"int_{i}", i // 3) for i in range(interviews))
+    )
+    db.executemany(
+        """INSERT INTO answers (interview_id, question_id, question_text, answer_text, ai_score, scoring_status, created_at)
+           VALUES (?, ?, 'Tell me about a project you led.', 'I led the migration of a payments service.', ?, 'done', 'now')""",
+        ((f"int_{n // questions}", n % questions + 1, random.randint(0, 100)) for n in range(interviews * questions))
+    )
+    return interviews
+
+
+def time_queries(db, interviews: int, lookups: int):
+    for label, sql in QUERIES.items():
+        param = random.randrange(interviews // 3) if label == "by-candidate" else f"int_{random.randrange(interviews)}"
+        plan = " / ".join(row[3] for row in db.execute("EXPLAIN QUERY PLAN " + sql, (param,)))
+        samples = []
+        for _ in range(lookups):
+            param = random.randrange(interviews // 3) if label == "by-candidate" else f"int_{random.randrange(interviews)}"
+            started = time.perf_counter()
+            db.execute(sql, (param,)).fetchall()
+            samples.append((time.perf_counter() - started) * 1000)
+        print(f"  {describe(label, samples)}\n    plan: {plan}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--answers", type=int, default=1_000_000)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--lookups", type=int, default=20)
+    args = parser.parse_args()
+
+    prepare_sandbox()
+    from migrations import MIGRATIONS, run_migrations, applied_versions
+
+    db = sqlite3.connect("bench.db", isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("BEGIN")
+    applied_versions(db)
+    version, name, base_schema = MIGRATIONS[0]
+    base_schema(db)
+    db.execute("INSERT INTO schema_migrations (version, name, applied_at) VALUES (?, ?, 'now')", (version, name))
+    started = time.perf_counter()
+    interviews = seed(db, args.answers, args.questions)
+    db.execute("COMMIT")
+    print(f"Seeded {interviews * args.questions} answers / {interviews} interviews in {time.perf_counter() - started:.1f}s")
+
+    print("\nBase schema (no indexes):")
+    time_queries(db, interviews, args.lookups)
+
+    started = time.perf_counter()
+    db.execute("BEGIN")
+    applied = run_migrations(db)
+    db.execute("COMMIT")
+    print(f"\nMigrations {applied} applied in {time.perf_counter() - started:.1f}s")
+    time_queries(db, interviews, args.lookups)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Question-fetch latency while many interviews are being created.
+
+Creates CONCURRENT_CREATES interviews at once (each one pays two fake LLM
+round-trips) while a poller keeps fetching a question of an existing
+interview. Every create posts a distinct JD, so none of them is answered by
+the LLM result cache and each really pays its round-trips. With the LLM work offloaded to the worker pool the poller's
+latency stays flat; in "inline" mode (the old behaviour) it stalls.
+
+    cd backend && python benchmarks/bench_event_loop.py
+"""
+import os
+import sys
+import time
+import asyncio
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import prepare_sandbox, install_fake_llm, describe
+
+CONCURRENT_CREATES = 20
+LLM_LATENCY = 0.5
+POLL_INTERVAL = 0.02
+JD_TEXT = "We are hiring a backend engineer with Python, Docker, SQL and AWS experience. " * 5
+
+
+def unique_jd(tag: str) -> str:
+    # Distinct content per create: identical text would be served from llm_cache
+    return f"{JD_TEXT}Requisition {tag}."
+
+
+async def _inline(fn, *args, **kwargs):
+    # The pre-offload behaviour: blocking call directly on the event loop.
+    return fn(*args, **kwargs)
+
+
+async def run(mode: str):
+    import httpx
+    import uploded
+    import llm_gateway
+
+    uploded.run_llm = llm_gateway.run_llm if mode == "offloaded" else _inline
+
+    transport = httpx.ASGITransport(app=uploded.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        seed = await client.post("/start-interview", data={"content": unique_jd(f"{mode}-seed"), "source": "resume"})
+        interview_id = seed.json()["interview_id"]
+
+        latencies = []
+        done = asyncio.Event()
+
+        async def poll():
+            # Latency is measured from when the fetch was *due*, so time spent
+            # waiting for a stalled event loop to wake the poller counts too.
+            while not done.is_set():
+                due = time.perf_counter() + POLL_INTERVAL
+                await asyncio.sleep(POLL_INTERVAL)
+                await client.get(f"/interview/{interview_id}/question/1")
+                latencies.append((time.perf_counter() - due) * 1000)
+
+        poller = asyncio.create_task(poll())
+        await asyncio.sleep(0.1)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            client.post("/start-interview", data={"content": unique_jd(f"{mode}-{n}"), "source": "job_description"})
+            for n in range(CONCURRENT_CREATES)
+        ])
+        create_wall = time.perf_counter() - start
+
+        done.set()
+        await poller
+
+    print(describe(f"question fetch ({mode})", latencies))
+    print(f"{'':<28} {CONCURRENT_CREATES} creates finished in {create_wall:.2f}s")
+
+
+if __name__ == "__main__":
+    prepare_sandbox()
+    fake = install_fake_llm(LLM_LATENCY)
+    print(f"Fake LLM latency: {LLM_LATENCY}s per call, {CONCURRENT_CREATES} concurrent interview creations\n")
+    for mode in ("inline", "offloaded"):
+        asyncio.run(run(mode))
@@ -0,0 +1,82 @@
+"""Session memory over a simulated multi-day run.
+
+Replays --days days of traffic on a fake clock: --per-day interviews start
+spread over each day, each one is hit REQUESTS times over ~30 minutes,
+and RESUME_RATE of them are resumed the next day (after their session has
+long gone idle). Compares the old unbounded dict with SessionStore, which
+rehydrates from a real SQLite file through the repository.
+
+    cd backend && python benchmarks/bench_session_store.py [--days 3 --per-day 2000]
+"""
+import os
+import sys
+import heapq
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import prepare_sandbox, SAMPLE_RESUME
+
+REQUESTS = 12
+INTERVIEW_MINUTES = 30
+RESUME_RATE = 0.1
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--per-day", type=int, default=2000)
+    parser.add_argument("--max-items", type=int, default=1000)
+    parser.add_argument("--idle-ttl", type=float, default=2 * 3600)
+    args = parser.parse_args()
+
+    prepare_sandbox()
+    import repository
+    from session_store import SessionStore, session_size
+
+    now = [0.0]
+    store = SessionStore(repository.get_interview, max_items=args.max_items, idle_ttl=args.idle_ttl, clock=lambda: now[0])
+    unbounded = {}
+    unbounded_bytes = 0
+
+    analysis = {"skills": ["Python", "FastAPI", "SQL"], "domains": ["Payments"], "important_keywords": ["Kafka"]}
+    questions = [{"question": f"Question {i}?", "difficulty": "Medium"} for i in range(10)]
+
+    # (time, interview_id, is_start)
+    events = []
+    for day in range(args.days):
+        for n in range(args.per_day):
+            interview_id = f"int_{day}_{n}"
+            start = day * 86400 + random.uniform(0, 86400)
+            heapq.heappush(events, (start, interview_id, True))
+            for _ in range(REQUESTS):
+                heapq.heappush(events, (start + random.uniform(0, INTERVIEW_MINUTES * 60), interview_id, False))
+            if random.random() < RESUME_RATE:
+                heapq.heappush(events, (start + 86400 + random.uniform(0, 3600), interview_id, False))
+
+    print(f"{'day':>4} {'dict items':>11} {'dict MB':>8} {'store items':>12} {'store MB':>9} {'hit rate':>9} {'rehydrated':>11}")
+    next_report = 86400 / 4
+    while events:
+        now[0], interview_id, is_start = heapq.heappop(events)
+        if is_start:
+            profile_text = SAMPLE_RESUME[:5000]
+            repository.create_interview.blocking(interview_id, "resume", profile_text, analysis, questions)
+            session = {"id": interview_id, "source": "resume", "profile_text": profile_text,
+                       "profile_analysis": analysis, "created_at": str(now[0])}
+            store.put(interview_id, dict(session))
+            unbounded[interview_id] = session
+            unbounded_bytes += session_size(session)
+        else:
+            assert store.load_blocking(interview_id), interview_id
+
+        if now[0] >= next_report:
+            stats = store.stats()
+            print(f"{now[0] / 86400:4.2f} {len(unbounded):11} {unbounded_bytes / 1e6:8.1f} {stats['items']:12} "
+                  f"{stats['memory_bytes'] / 1e6:9.2f} {stats['hit_rate']:9.3f} {stats['rehydrated']:11}")
+            next_report += 86400 / 4
+
+    print(store.stats())
+
+
+if __name__ == "__main__":
+    main()
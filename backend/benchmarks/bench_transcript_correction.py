@@ -0,0 +1,94 @@
+"""Accuracy and speed of transcript term correction.
+
+Runs CorrectionIndex over known-good and known-bad cases: resume terms that
+Whisper mangles must be fixed, and everyday words one letter away from a short
+term ("reach" / React) must be left alone, and neither terms nor name parts
+may swallow the short words around them. Exits non-zero on any miss, then
+times a long transcript.
+
+    cd backend && python benchmarks/bench_transcript_correction.py [--words 4200]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import prepare_sandbox
+
+ANALYSIS = {
+    "skills": ["Python", "React", "Spring", "Swift", "Flask", "Kubernetes", "PostgreSQL", "JavaScript"],
+    "tools_and_technologies": ["Docker", "MySQL", "FastAPI", "Redis", "Terraform", "Spring Boot"],
+    "important_keywords": ["Microservices", "CI/CD"],
+    "domains": ["Payments"]
+}
+CANDIDATE = "John Smith"
+
+# (heard, expected)
+CASES = [
+    ("we deployed it on cuber netties last year", "we deployed it on Kubernetes last year"),
+    ("the data lives in post gress QL", "the data lives in PostgreSQL"),
+    ("I moved the schema to my sql", "I moved the schema to MySQL"),
+    ("the service runs on fast api", "the service runs on FastAPI"),
+    ("we split it into micro services", "we split it into Microservices"),
+    ("infrastructure is in terra form", "infrastructure is in Terraform"),
+    ("my name is Jon Smith", "my name is John Smith"),
+    # Everyday words one edit from a short term stay as spoken
+    ("I wanted to reach the team", "I wanted to reach the team"),
+    ("parse the string first", "parse the string first"),
+    ("I worked the night shift", "I worked the night shift"),
+    ("a flash of insight", "a flash of insight"),
+    ("the case was on the docket", "the case was on the docket"),
+    ("how did they react to it", "how did they react to it"),
+    ("I read it before the release", "I read it before the release"),
+    # A term must not swallow the short word next to it
+    ("I used a Kubernetes cluster", "I used a Kubernetes cluster"),
+]
+
+# (candidate, heard, expected): parts of other names next to everyday words
+NAME_CASES = [
+    ("Sagar Oraganti", "my name is sagar", "my name is Sagar"),
+    ("Will Smith", "I will explain", "I will explain"),
+    ("Anna Petrova", "an a student", "an a student"),
+]
+
+PLAIN_TEXT = (
+    "In my last role I was responsible for the reporting service and I worked closely with the product team. "
+    "We had a tight deadline so I broke the work into smaller tasks, reviewed the design with two senior "
+    "engineers and shipped the first version in three weeks. The biggest challenge was handling traffic spikes, "
+    "which we solved by adding a queue in front of the slow parts and caching results that rarely change. "
+    "Looking back, I would invest in better monitoring earlier and write more tests before the launch. "
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=4200)
+    args = parser.parse_args()
+
+    prepare_sandbox()
+    from transcript_correction import CorrectionIndex, analysis_terms
+
+    index = CorrectionIndex(analysis_terms(ANALYSIS), CANDIDATE)
+    cases = [(CANDIDATE, heard, expected) for heard, expected in CASES + [(PLAIN_TEXT.strip(), PLAIN_TEXT.strip())]]
+    failures = 0
+    for candidate, heard, expected in cases + NAME_CASES:
+        got = (index if candidate == CANDIDATE else CorrectionIndex(analysis_terms(ANALYSIS), candidate)).correct(heard)
+        ok = got == expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {heard[:60]!r} -> {got[:60]!r}")
+        if not ok:
+            print(f"     expected {expected[:60]!r}")
+
+    words = (PLAIN_TEXT + " ".join(heard for heard, _ in CASES) + " ").split()
+    transcript = " ".join(words[i % len(words)] for i in range(args.words))
+    started = time.perf_counter()
+    index.correct(transcript)
+    print(f"\n{args.words}-word transcript corrected in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    if failures:
+        sys.exit(f"{failures} case(s) failed")
+
+
+if __name__ == "__main__":
+    main()
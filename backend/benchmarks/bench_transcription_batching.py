@@ -0,0 +1,68 @@
+"""Throughput vs latency of transcription micro-batching.
+
+Fires CONCURRENT requests at once (many candidates finishing an answer at
+the same moment) through TranscriptionPool for each (max_batch, window)
+setting. max_batch=1 is the unbatched baseline. Only clips with the same
+prompt share a pass; --prompts N spreads the requests over N distinct prompts
+(different candidates) to show how that limits batching.
+
+Needs ffmpeg, numpy and openai-whisper (the backend with a batched pass).
+
+    cd backend && python benchmarks/bench_transcription_batching.py --concurrent 8 --configs 1:0,4:50,8:100
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import prepare_sandbox, percentile, recorded_answers
+from bench_vad import load_pcm
+
+
+async def run(pool, clips, prompts: int):
+    latencies = []
+
+    async def one(n, clip):
+        started = time.perf_counter()
+        await pool.transcribe(clip, initial_prompt=f"This is a job interview. The candidate's name is Candidate {n % prompts}.")
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(n, clip) for n, clip in enumerate(clips)])
+    return time.perf_counter() - started, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrent", type=int, default=8)
+    parser.add_argument("--configs", default="1:0,2:50,4:50,8:100", help="max_batch:window_ms,...")
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--prompts", type=int, default=1, help="distinct initial prompts across the requests")
+    args = parser.parse_args()
+
+    files = recorded_answers()
+    prepare_sandbox()
+    from transcription_pool import TranscriptionPool
+
+    # Short clips (<= 30 s) are the ones that batch; cycle through the fixtures
+    sources = [load_pcm(path)[:30 * 16000] for path in files]
+    clips = [sources[i % len(sources)] for i in range(args.concurrent)]
+    audio_seconds = sum(len(c) for c in clips) / 16000
+
+    for config in args.configs.split(","):
+        max_batch, window_ms = config.split(":")
+        pool = TranscriptionPool(workers=args.workers, queue_size=args.concurrent,
+                                 max_batch=int(max_batch), batch_window_ms=float(window_ms))
+        pool.warm_up()
+        wall, latencies = asyncio.run(run(pool, clips, max(args.prompts, 1)))
+        stats = pool.stats()
+        print(f"max_batch={pool.max_batch:<2} window={window_ms:>4}ms  "
+              f"throughput={len(clips) / wall:5.2f} clips/s ({audio_seconds / wall:6.1f} audio-s/s)  "
+              f"p50={percentile(latencies, 50):7.0f}ms p95={percentile(latencies, 95):7.0f}ms  "
+              f"batches={stats['batches']} avg_size={stats['avg_batch_size']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Startup time and real-time factor (RTF) of the transcription engines.
+
+1. App import time: the Whisper model is no longer loaded on import, so this
+   should be well under the old multi-second `whisper.load_model("small")`.
+2. Per backend: model load time, warm-up time, and RTF (decode seconds /
+   audio seconds; lower is faster) over the recorded answers in uploads/.
+
+Needs ffmpeg plus openai-whisper and/or faster-whisper installed.
+
+    cd backend && python benchmarks/bench_transcription_engine.py --backends openai,faster --model small
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import prepare_sandbox, recorded_answers
+
+
+def audio_seconds(path: str) -> float:
+    out = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return float(out) if out and out != "N/A" else 0.0
+
+
+def bench_import() -> float:
+    started = time.perf_counter()
+    import uploded  # noqa: F401
+    return time.perf_counter() - started
+
+
+def bench_backend(backend: str, model_size: str, files):
+    from transcription_engine import create_engine
+
+    engine = create_engine(backend, model_size)
+    started = time.perf_counter()
+    engine.load()
+    load_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    engine.warm_up()
+    warm_s = time.perf_counter() - started
+
+    total_audio = total_decode = 0.0
+    for path in files:
+        seconds = audio_seconds(path)
+        started = time.perf_counter()
+        engine.transcribe(path, initial_prompt="This is a job interview.")
+        decode = time.perf_counter() - started
+        total_audio += seconds
+        total_decode += decode
+        print(f"  {os.path.basename(path):<45} audio={seconds:6.1f}s decode={decode:6.2f}s rtf={decode / seconds if seconds else 0:5.2f}")
+
+    rtf = total_decode / total_audio if total_audio else 0.0
+    print(f"{engine.name:<16} model={model_size:<8} load={load_s:6.2f}s warm-up={warm_s:6.2f}s "
+          f"audio={total_audio:6.1f}s decode={total_decode:6.2f}s RTF={rtf:5.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", default="openai,faster")
+    parser.add_argument("--model", default=os.getenv("WHISPER_MODEL", "small"))
+    args = parser.parse_args()
+
+    files = recorded_answers()
+    prepare_sandbox()
+
+    print(f"App import (no model load): {bench_import():.2f}s")
+    print(f"Transcribing {len(files)} recordings\n")
+    for backend in args.backends.split(","):
+        try:
+            bench_backend(backend.strip(), args.model, files)
+        except ImportError as e:
+            print(f"{backend}: skipped ({e})")
+
+
+if __name__ == "__main__":
+    main()
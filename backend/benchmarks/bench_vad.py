@@ -0,0 +1,75 @@
+"""Audio seconds decoded vs speech seconds kept by the VAD stage.
+
+Decodes every recording in uploads/ to 16 kHz PCM, runs the energy VAD and
+reports how much audio Whisper would have had to process without it. With
+--transcribe it also times a real decode with and without trimming.
+
+Needs ffmpeg and numpy (plus a Whisper backend for --transcribe).
+
+    cd backend && python benchmarks/bench_vad.py [--transcribe]
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import prepare_sandbox, recorded_answers
+
+
+def load_pcm(path: str):
+    from audio_decode import ffmpeg_pcm_command, pcm_to_float32
+    with open(path, "rb") as f:
+        pcm = subprocess.run(ffmpeg_pcm_command(), input=f.read(), capture_output=True, check=True).stdout
+    return pcm_to_float32(pcm)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transcribe", action="store_true")
+    args = parser.parse_args()
+
+    files = recorded_answers()
+    prepare_sandbox()
+    from vad import trim_silence
+
+    engine = None
+    if args.transcribe:
+        from transcription_engine import get_engine
+        engine = get_engine()
+        engine.warm_up()
+
+    total_audio = total_speech = 0.0
+    plain_s = trimmed_s = 0.0
+    for path in files:
+        samples = load_pcm(path)
+        started = time.perf_counter()
+        _, speech_map = trim_silence(samples)
+        vad_ms = (time.perf_counter() - started) * 1000
+        total_audio += speech_map.audio_seconds
+        total_speech += speech_map.speech_seconds
+        line = (f"{os.path.basename(path):<45} audio={speech_map.audio_seconds:6.1f}s "
+                f"speech={speech_map.speech_seconds:6.1f}s regions={len(speech_map.regions):<3} vad={vad_ms:5.1f}ms")
+
+        if engine:
+            started = time.perf_counter()
+            engine.transcribe(samples, vad=False)
+            plain = time.perf_counter() - started
+            started = time.perf_counter()
+            engine.transcribe(samples, vad=True)
+            trimmed = time.perf_counter() - started
+            plain_s += plain
+            trimmed_s += trimmed
+            line += f"  whisper: full={plain:5.2f}s trimmed={trimmed:5.2f}s"
+        print(line)
+
+    if total_audio:
+        print(f"\nTotal audio {total_audio:.1f}s -> speech {total_speech:.1f}s "
+              f"({100 * total_speech / total_audio:.0f}% kept, {total_audio - total_speech:.1f}s of silence skipped)")
+    if engine and trimmed_s:
+        print(f"Whisper time: {plain_s:.2f}s -> {trimmed_s:.2f}s ({plain_s / trimmed_s:.2f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
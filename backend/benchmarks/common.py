@@ -0,0 +1,169 @@
+"""Shared helpers for the backend benchmark scripts.
+
+Benchmarks run against a throw-away working directory (so `interviews.db`
+and `uploads/` are never touched) and a fake OpenRouter client with a fixed
+latency, so results measure our own overhead rather than the network.
+"""
+import os
+import re
+import sys
+import json
+import glob
+import time
+import tempfile
+from types import SimpleNamespace
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+
+
+SAMPLE_RESUME = """Jane Doe
+Senior Backend Engineer
+jane.doe@example.com | +1 555 0100 | github.com/janedoe
+
+Summary
+Backend engineer with 7 years of experience designing and operating Python services,
+data pipelines and cloud infrastructure for high-traffic consumer products.
+
+Experience
+Senior Software Engineer
+Acme Payments
+Led the migration of the payments ledger from a monolith to Python microservices on
+Kubernetes. Designed idempotent REST APIs with FastAPI and PostgreSQL, introduced Redis
+caching and cut p95 latency from 480ms to 120ms. Mentored four engineers, ran design
+reviews and owned the on-call rotation for the ledger and reconciliation services.
+
+Software Engineer
+Globex Analytics
+Built batch and streaming ETL jobs with Pandas, Kafka and AWS Glue processing 2 TB per day.
+Wrote Terraform modules for the data platform and set up CI/CD pipelines in Jenkins and
+GitHub Actions. Added data-quality checks that reduced failed reports by 70 percent.
+
+Junior Developer
+Initech
+Maintained Django internal tools, wrote SQL reports and automated deployments with Ansible.
+
+Projects
+Project: Realtime Fraud Scoring
+Streaming feature pipeline with Kafka and a scikit-learn model served behind gRPC.
+Project: Open-source Rate Limiter
+Token-bucket rate limiter library for asyncio with Redis backend, 1.2k GitHub stars.
+
+Skills
+Python, Go, SQL, FastAPI, Django, Flask, PostgreSQL, MySQL, Redis, MongoDB, Kafka, Docker,
+Kubernetes, Terraform, Ansible, AWS, Google Cloud, Git, CI/CD, REST API, GraphQL,
+Microservices, TDD, Agile, Pandas, NumPy, scikit-learn, Machine Learning
+
+Education
+B.Sc. Computer Science, State University
+
+Certifications
+AWS Certified Solutions Architect - Associate
+Certified Kubernetes Application Developer
+""" * 3
+
+
+def prepare_sandbox() -> str:
+    """chdir into a fresh temp dir and make the backend modules importable."""
+    workdir = tempfile.mkdtemp(prefix="interview_bench_")
+    os.chdir(workdir)
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    os.environ.setdefault("OPENROUTER_API_KEY", "bench-key")
+    return workdir
+
+
+def recorded_answers() -> list:
+    """The .webm answer recordings in the repo's uploads/; exits when there are none."""
+    folder = os.path.join(REPO_DIR, "uploads")
+    files = sorted(glob.glob(os.path.join(folder, "*.webm")))
+    if not files:
+        sys.exit(f"No .webm recordings found in {folder}")
+    return files
+
+
+def _canned_reply(prompt: str) -> str:
+    if "Analyze the following resume or job description" in prompt:
+        return json.dumps({
+            "skills": ["Python", "FastAPI", "SQL"],
+            "projects": ["Mock interview platform"],
+            "tools_and_technologies": ["Docker", "Git"],
+            "experience_level": "Mid",
+            "domains": ["Web"],
+            "important_keywords": ["REST API", "Microservices"]
+        })
+    if "technical recruiter" in prompt:
+        return json.dumps({
+            "extracted_keywords": ["Python", "Docker"],
+            "questions": [
+                {"question": f"Benchmark question {i}?", "difficulty": "Medium", "type": "Technical", "category": "Python"}
+                for i in range(6)
+            ]
+        })
+    if "Answers to evaluate:" in prompt:
+        count = len(re.findall(r"^\[\d+\] Question:", prompt, flags=re.MULTILINE))
+        return json.dumps({"results": [
+            {"index": i, "corrected_answer": "Suggested Answer: ...", "overall_score": 70, "feedback": "Solid answer.", "keywords": ["python"]}
+            for i in range(1, count + 1)
+        ]})
+    if "follow-up" in prompt.lower():
+        return json.dumps({"question": "Can you go deeper on that?", "difficulty": "Medium", "type": "Follow-up", "category": "Deep Dive"})
+    return json.dumps({
+        "corrected_answer": "Suggested Answer: ...",
+        "overall_score": 70,
+        "feedback": "Solid answer.",
+        "keywords": ["python"]
+    })
+
+
+class FakeLLMClient:
+    """Stands in for the OpenAI client: sleeps `latency` seconds per call (like a
+    blocking network round-trip), plus `latency_per_1k_tokens` for prompt size,
+    and returns canned JSON for each prompt type."""
+
+    def __init__(self, latency: float = 0.5, latency_per_1k_tokens: float = 0.0):
+        self.latency = latency
+        self.latency_per_1k_tokens = latency_per_1k_tokens
+        self.calls = 0
+        self.prompt_chars = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, **kwargs):
+        self.calls += 1
+        prompt = "\n".join(m["content"] for m in messages)
+        self.prompt_chars += len(prompt)
+        time.sleep(self.latency + self.latency_per_1k_tokens * estimate_tokens(prompt) / 1000)
+        content = _canned_reply(prompt)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=estimate_tokens(prompt), completion_tokens=estimate_tokens(content))
+        )
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English prose
+    return len(text) // 4
+
+
+def install_fake_llm(latency: float = 0.5, latency_per_1k_tokens: float = 0.0) -> FakeLLMClient:
+    import llm_gateway
+    fake = FakeLLMClient(latency, latency_per_1k_tokens)
+    llm_gateway._client = fake
+    return fake
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def describe(label: str, samples_ms) -> str:
+    return (
+        f"{label:<28} n={len(samples_ms):<4} "
+        f"p50={percentile(samples_ms, 50):8.1f}ms  "
+        f"p95={percentile(samples_ms, 95):8.1f}ms  "
+        f"max={max(samples_ms) if samples_ms else 0:8.1f}ms"
+    )
@@ -0,0 +1,83 @@
+"""Replay recorded answers through /ws/transcribe as if they were being recorded.
+
+Each .webm fixture is cut into timeslices (like MediaRecorder.start(TIMESLICE_MS))
+and sent at real-time pace. Prints every partial hypothesis, then the final
+transcript and how long it took to arrive after the last chunk.
+
+Needs ffmpeg/ffprobe and a Whisper backend (see transcription_engine.py).
+
+    cd backend && TRANSCRIBE_WORKERS=0 python benchmarks/ws_transcribe_replay.py [files...]
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import prepare_sandbox, recorded_answers
+
+TIMESLICE_MS = 1000
+
+
+def duration_seconds(path: str) -> float:
+    out = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True, text=True
+    ).stdout.strip()
+    try:
+        return float(out)
+    except ValueError:
+        return 0.0
+
+
+def replay(client, path: str, realtime: bool):
+    data = open(path, "rb").read()
+    seconds = duration_seconds(path) or len(data) / 4000  # ~32 kbit/s Opus if ffprobe can't tell
+    slices = max(1, int(seconds * 1000 / TIMESLICE_MS))
+    chunk_size = len(data) // slices + 1
+
+    print(f"\n▶ {os.path.basename(path)} ({seconds:.1f}s, {slices} chunks)")
+    started = time.perf_counter()
+    with client.websocket_connect("/ws/transcribe?candidate_name=Candidate") as ws:
+        for i in range(0, len(data), chunk_size):
+            ws.send_bytes(data[i:i + chunk_size])
+            if realtime:
+                time.sleep(TIMESLICE_MS / 1000)
+        ws.send_text("end")
+        last_chunk_at = time.perf_counter()
+
+        while True:
+            message = ws.receive_json()
+            elapsed = time.perf_counter() - started
+            if message["type"] == "partial":
+                print(f"  [{elapsed:5.1f}s] partial @ {message['audio_seconds']:5.1f}s audio: {message['text'][-80:]}")
+                continue
+            if message["type"] == "final":
+                print(f"  final after last chunk: {(time.perf_counter() - last_chunk_at) * 1000:.0f}ms "
+                      f"(server finalize {message['finalize_ms']:.0f}ms, {message['decodes']} decodes)")
+                print(f"  text: {message['text']}")
+            else:
+                print(f"  error: {message}")
+            break
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--fast", action="store_true", help="send chunks as fast as possible")
+    args = parser.parse_args()
+
+    files = [os.path.abspath(f) for f in args.files] or recorded_answers()
+    prepare_sandbox()
+
+    from fastapi.testclient import TestClient
+    import uploded
+
+    with TestClient(uploded.app) as client:
+        for path in files:
+            replay(client, path, realtime=not args.fast)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,77 +1,67 @@
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 
-conn = sqlite3.connect("interviews.db", check_same_thread=False)
-cursor = conn.cursor()
-
-# Candidates
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS candidates (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    name TEXT UNIQUE,
-    created_at TEXT
-)
-""")
-
-# Interviews
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS interviews (
-    id TEXT PRIMARY KEY,
-    candidate_id INTEGER,
-    source TEXT,
-    created_at TEXT,
-    FOREIGN KEY(candidate_id) REFERENCES candidates(id)
-)
-""")
-
-# Answers (BASE TABLE)
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS answers (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    interview_id TEXT,
-    question_id INTEGER,
-    question_text TEXT,
-    answer_text TEXT,
-    created_at TEXT,
-    FOREIGN KEY(interview_id) REFERENCES interviews(id)
-)
-""")
-
-# Admins
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS admins (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    username TEXT UNIQUE,
-    password TEXT,
-    created_at TEXT
-)
-""")
-
-# Pre-created Interview Sessions (for Admin generated links)
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS interview_sessions (
-    link_id TEXT PRIMARY KEY,
-    candidate_name TEXT,
-    resume_text TEXT,
-    job_description TEXT,
-    status TEXT DEFAULT 'pending',
-    created_by INTEGER,
-    created_at TEXT
-)
-""")
-
-# 🔹 ADD AI COLUMNS (SAFE)
-def add_column_if_not_exists(table, column, datatype):
+from migrations import run_migrations
+
+DB_PATH = os.getenv("INTERVIEWS_DB_PATH", "interviews.db")
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")  # NORMAL is durable enough with WAL
+
+# 🔹 One connection per thread instead of a single shared cursor. WAL lets
+# readers run while a writer commits; statements outside transaction() autocommit.
+_local = threading.local()
+_connections_lock = threading.Lock()
+connections_opened = 0
+
+
+def get_connection() -> sqlite3.Connection:
+    """This thread's connection, opened (with the pragmas below) on first use."""
+    global connections_opened
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, isolation_level=None, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={DB_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}")
+        _local.conn = conn
+        with _connections_lock:
+            connections_opened += 1
+    return conn
+
+
+@contextmanager
+def transaction():
+    """Run several statements atomically: BEGIN IMMEDIATE ... COMMIT, ROLLBACK on error.
+
+    Yields this thread's connection. Nested use joins the outer transaction.
+    """
+    conn = get_connection()
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN IMMEDIATE")
     try:
-        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {datatype}")
-    except sqlite3.OperationalError:
-        pass  # column already exists
-
-add_column_if_not_exists("answers", "ai_score", "INTEGER")
-add_column_if_not_exists("answers", "ai_feedback", "TEXT")
-add_column_if_not_exists("answers", "ai_keywords", "TEXT")
-add_column_if_not_exists("answers", "corrected_answer", "TEXT")
-add_column_if_not_exists("interviews", "recording_path", "TEXT")
-add_column_if_not_exists("interviews", "profile_text", "TEXT")
-add_column_if_not_exists("interviews", "questions", "TEXT") # JSON string
-
-conn.commit()
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def execute(sql: str, params=()) -> sqlite3.Cursor:
+    return get_connection().execute(sql, params)
+
+
+def query_one(sql: str, params=()):
+    return get_connection().execute(sql, params).fetchone()
+
+
+def query_all(sql: str, params=()) -> list:
+    return get_connection().execute(sql, params).fetchall()
+
+
+# Schema changes live in migrations.py; only steps this database hasn't applied yet run
+with transaction() as db:
+    run_migrations(db)
@@ -0,0 +1,114 @@
+import time
+import uuid
+import asyncio
+import inspect
+from collections import OrderedDict
+
+# 🔹 Small in-process job queue: bounded concurrency, optional bounded backlog,
+# and per-job status that routes can poll (or await) while the work runs.
+
+
+class JobQueue:
+    def __init__(self, name: str, concurrency: int = 2, maxsize: int = 0, history: int = 1000):
+        self.name = name
+        self.concurrency = concurrency
+        self.maxsize = maxsize
+        self.history = history
+
+        self.jobs = OrderedDict()  # job_id -> status record
+        self._events = {}
+        self._queue = None
+        self._loop = None
+        self._workers = []
+        self._running = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _ensure_workers(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # First use (or a new event loop, e.g. after a reload): start fresh workers.
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._workers = [loop.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    def submit(self, fn, *args, job_id: str = None, **kwargs) -> str:
+        """Queue `fn(*args, **kwargs)` (sync or async) and return its job id.
+
+        Raises asyncio.QueueFull when the backlog is at `maxsize`.
+        """
+        self._ensure_workers()
+        job_id = job_id or uuid.uuid4().hex
+        self._queue.put_nowait((job_id, fn, args, kwargs))
+        self.jobs[job_id] = {
+            "job_id": job_id,
+            "status": "queued",
+            "queued_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None
+        }
+        self._events[job_id] = asyncio.Event()
+        self._trim_history()
+        return job_id
+
+    def _trim_history(self):
+        while len(self.jobs) > self.history:
+            oldest_id, oldest = next(iter(self.jobs.items()))
+            if oldest["status"] in ("queued", "running"):
+                break
+            self.jobs.pop(oldest_id)
+            self._events.pop(oldest_id, None)
+
+    async def _worker(self):
+        while True:
+            job_id, fn, args, kwargs = await self._queue.get()
+            job = self.jobs.get(job_id) or {"job_id": job_id}
+            job["status"] = "running"
+            job["started_at"] = time.time()
+            self._running += 1
+            try:
+                result = fn(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+                job["result"] = result
+                job["status"] = "done"
+                self.completed += 1
+            except Exception as e:
+                print(f"⚠️ [{self.name}] job {job_id} failed: {e}")
+                job["error"] = str(e)
+                job["status"] = "failed"
+                self.failed += 1
+            finally:
+                self._running -= 1
+                job["finished_at"] = time.time()
+                event = self._events.get(job_id)
+                if event:
+                    event.set()
+                self._queue.task_done()
+
+    def get(self, job_id: str):
+        return self.jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float = None):
+        """Wait for a job to finish and return its status record (None if unknown)."""
+        event = self._events.get(job_id)
+        if event is None:
+            return self.jobs.get(job_id)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.jobs.get(job_id)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "running": self._running,
+            "completed": self.completed,
+            "failed": self.failed
+        }
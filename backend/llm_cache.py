@@ -0,0 +1,162 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+from database import DB_PATH
+
+# 🔹 Content-addressed cache for LLM results (profile analysis, JD question sets).
+# Recruiters reuse the same JD for many candidates, so identical input text +
+# model + prompt version is answered from here instead of a new LLM call.
+CACHE_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), "llm_cache.db")
+LLM_CACHE_MEMORY_ITEMS = int(os.getenv("LLM_CACHE_MEMORY_ITEMS", "256"))
+LLM_CACHE_MAX_ROWS = int(os.getenv("LLM_CACHE_MAX_ROWS", "5000"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def make_key(kind: str, text: str, model: str, prompt_version: str) -> str:
+    payload = "\x1f".join([kind, model, prompt_version, normalize_text(text)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """In-memory LRU in front of a SQLite table, with size and TTL eviction.
+
+    Values must be JSON serializable. They are stored serialized, so callers
+    always get a fresh copy they are free to mutate. The memory tier is bounded
+    by item count and, when max_memory_bytes is set, by serialized size.
+    Pass db_path=":memory:" for a cache that is not persisted.
+    """
+
+    def __init__(self, db_path: str, table: str = "llm_cache",
+                 max_memory_items: int = LLM_CACHE_MEMORY_ITEMS,
+                 max_rows: int = LLM_CACHE_MAX_ROWS,
+                 ttl_seconds: float = LLM_CACHE_TTL,
+                 max_memory_bytes: int = 0):
+        self.table = table
+        self.max_memory_items = max_memory_items
+        self.max_memory_bytes = max_memory_bytes
+        self.memory_bytes = 0
+        self.max_rows = max_rows
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> (created_at, serialized value)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                created_at REAL,
+                last_used REAL
+            )
+        """)
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_last_used ON {table}(last_used)")
+        self._conn.commit()
+
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, created_at: float, serialized: str):
+        self._forget(key)
+        self._memory[key] = (created_at, serialized)
+        self.memory_bytes += len(serialized)
+        while len(self._memory) > self.max_memory_items or (
+            self.max_memory_bytes and self.memory_bytes > self.max_memory_bytes and len(self._memory) > 1
+        ):
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+            self.counters["evictions"] += 1
+
+    def _forget(self, key: str):
+        entry = self._memory.pop(key, None)
+        if entry:
+            self.memory_bytes -= len(entry[1])
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry:
+                if not self._expired(entry[0], now):
+                    self._memory.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    return json.loads(entry[1])
+                self._forget(key)
+                self.counters["expired"] += 1
+
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row and not self._expired(row[1], now):
+                self._conn.execute(f"UPDATE {self.table} SET last_used = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                self._remember(key, row[1], row[0])
+                self.counters["disk_hits"] += 1
+                return json.loads(row[0])
+
+            if row:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                self.counters["expired"] += 1
+            self.counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value):
+        now = time.time()
+        serialized = json.dumps(value)
+        with self._lock:
+            self._remember(key, now, serialized)
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, serialized, now, now)
+            )
+            if self.ttl_seconds > 0:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (now - self.ttl_seconds,))
+            # Size bound: drop the least recently used rows beyond max_rows
+            deleted = self._conn.execute(f"""
+                DELETE FROM {self.table} WHERE key IN (
+                    SELECT key FROM {self.table} ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_rows,)).rowcount
+            self._conn.commit()
+            self.counters["stores"] += 1
+            self.counters["evictions"] += max(deleted, 0)
+
+    def purge(self) -> int:
+        with self._lock:
+            self._memory.clear()
+            self.memory_bytes = 0
+            removed = self._conn.execute(f"DELETE FROM {self.table}").rowcount
+            self._conn.commit()
+            return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            lookups = self.counters["memory_hits"] + self.counters["disk_hits"] + self.counters["misses"]
+            hits = lookups - self.counters["misses"]
+            return {
+                **self.counters,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "memory_bytes": self.memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "disk_rows": rows,
+                "max_memory_items": self.max_memory_items,
+                "max_rows": self.max_rows,
+                "ttl_seconds": self.ttl_seconds
+            }
+
+
+llm_cache = ResultCache(CACHE_DB_PATH)
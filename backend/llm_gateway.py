@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from openai import OpenAI
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 🔹 One process-wide OpenRouter client with a keep-alive connection pool.
+# Every LLM call in the backend goes through here so TLS handshakes and
+# sockets are reused instead of being rebuilt on each request.
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+DEFAULT_MODEL = "openai/gpt-4o-mini"
+
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "1"))
+
+# Circuit breaker: after this many consecutive failures (or any 402 quota error)
+# calls fail fast to the offline fallbacks while a probe checks for recovery.
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "3"))
+LLM_BREAKER_PROBE_INTERVAL = float(os.getenv("LLM_BREAKER_PROBE_INTERVAL", "30"))
+
+_client = None
+_client_lock = threading.Lock()
+
+# Worker pool for LLM calls made from async routes. Sized like the connection
+# pool so every worker can hold a connection without queueing on the socket.
+_llm_executor = ThreadPoolExecutor(max_workers=LLM_POOL_SIZE, thread_name_prefix="llm")
+
+
+class LLMUnavailable(Exception):
+    """Raised instead of calling OpenRouter while the circuit breaker is open."""
+
+
+def _status_code(error: Exception):
+    return getattr(error, "status_code", None)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, probe_interval: float):
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.state = "closed"  # closed -> open -> (half_open while probing) -> closed
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self.short_circuited = 0
+        self.trips = 0
+        self._lock = threading.Lock()
+        self._probe_thread = None
+
+    def before_call(self):
+        if self.state != "closed":
+            self.short_circuited += 1
+            raise LLMUnavailable(f"LLM circuit open: {self.last_error}")
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+
+    def record_failure(self, error: Exception):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"[:300]
+            quota_exceeded = _status_code(error) == 402
+            if self.state == "closed" and (quota_exceeded or self.consecutive_failures >= self.failure_threshold):
+                self._trip()
+
+    def _trip(self):
+        self.state = "open"
+        self.opened_at = time.time()
+        self.trips += 1
+        print(f"⚠️ LLM circuit opened ({self.last_error}); using offline fallbacks")
+        if self._probe_thread is None or not self._probe_thread.is_alive():
+            self._probe_thread = threading.Thread(target=self._probe_loop, name="llm-breaker-probe", daemon=True)
+            self._probe_thread.start()
+
+    def _probe_loop(self):
+        while self.state != "closed":
+            time.sleep(self.probe_interval)
+            self.state = "half_open"
+            try:
+                _probe()
+            except Exception as e:
+                with self._lock:
+                    self.state = "open"
+                    self.last_error = f"{type(e).__name__}: {e}"[:300]
+                continue
+            with self._lock:
+                self.state = "closed"
+                self.consecutive_failures = 0
+                self.opened_at = None
+            print("✅ LLM circuit closed: OpenRouter reachable again")
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "opened_at": self.opened_at,
+            "last_error": self.last_error,
+            "trips": self.trips,
+            "short_circuited_calls": self.short_circuited
+        }
+
+
+breaker = CircuitBreaker(LLM_BREAKER_FAILURES, LLM_BREAKER_PROBE_INTERVAL)
+
+
+def _build_http_client() -> httpx.Client:
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=LLM_POOL_SIZE,
+            max_keepalive_connections=LLM_POOL_SIZE,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+    )
+
+
+def get_client() -> OpenAI:
+    """Return the shared OpenRouter client, creating it on first use."""
+    global _client
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is None:
+            api_key = os.getenv("OPENROUTER_API_KEY")
+            if not api_key:
+                # Don't cache a broken client: the key may be configured later.
+                raise RuntimeError("OPENROUTER_API_KEY not found in environment")
+            _client = OpenAI(
+                base_url=OPENROUTER_BASE_URL,
+                api_key=api_key,
+                http_client=_build_http_client(),
+                max_retries=LLM_MAX_RETRIES,
+            )
+    return _client
+
+
+def chat_completion(messages, model: str = DEFAULT_MODEL, **kwargs) -> str:
+    """Run a chat completion on the pooled client and return the reply text.
+
+    `messages` may be a plain prompt string or a list of chat messages.
+    """
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+
+    breaker.before_call()
+    client = get_client()
+    try:
+        response = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            **kwargs
+        )
+    except Exception as e:
+        breaker.record_failure(e)
+        raise
+    breaker.record_success()
+
+    if not response.choices:
+        raise ValueError("Invalid API structure")
+    return response.choices[0].message.content
+
+
+def _probe():
+    # Smallest possible completion: proves reachability and that the key has credit
+    get_client().chat.completions.create(
+        model=DEFAULT_MODEL,
+        messages=[{"role": "user", "content": "ping"}],
+        max_tokens=1
+    )
+
+
+def submit_llm(fn, *args, **kwargs):
+    """Start an LLM-backed function on the worker pool; returns a concurrent Future."""
+    return _llm_executor.submit(fn, *args, **kwargs)
+
+
+async def run_llm(fn, *args, **kwargs):
+    """Run a blocking LLM-backed function on the LLM worker pool.
+
+    Async routes must await this instead of calling `fn` directly, otherwise
+    the network round-trip stalls the event loop for every other request.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_llm_executor, functools.partial(fn, *args, **kwargs))
+
+
+def extract_json(raw: str):
+    """Parse the outermost JSON object out of an LLM reply."""
+    start = raw.find("{")
+    end = raw.rfind("}") + 1
+    if start == -1 or end == 0:
+        raise ValueError("No JSON found")
+    return json.loads(raw[start:end])
@@ -0,0 +1,208 @@
+import json
+import sqlite3
+from datetime import datetime
+
+# 🔹 Versioned schema changes for interviews.db. Applied versions are recorded
+# in schema_migrations, so startup only runs the steps a database hasn't seen
+# yet instead of re-issuing every CREATE/ALTER on each import. Append new steps
+# to MIGRATIONS; never edit or reorder one that has shipped.
+
+
+def add_column(db: sqlite3.Connection, table: str, column: str, datatype: str):
+    columns = {row[1] for row in db.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {datatype}")
+
+
+def m001_base_schema(db: sqlite3.Connection):
+    """Tables and the columns that used to be added ad hoc on every start.
+
+    Databases created before migrations existed already have some or all of
+    this, so every step here tolerates it being present.
+    """
+    # Candidates
+    db.execute("""
+    CREATE TABLE IF NOT EXISTS candidates (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE,
+        created_at TEXT
+    )
+    """)
+
+    # Interviews
+    db.execute("""
+    CREATE TABLE IF NOT EXISTS interviews (
+        id TEXT PRIMARY KEY,
+        candidate_id INTEGER,
+        source TEXT,
+        created_at TEXT,
+        FOREIGN KEY(candidate_id) REFERENCES candidates(id)
+    )
+    """)
+
+    # Answers (BASE TABLE)
+    db.execute("""
+    CREATE TABLE IF NOT EXISTS answers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        interview_id TEXT,
+        question_id INTEGER,
+        question_text TEXT,
+        answer_text TEXT,
+        created_at TEXT,
+        FOREIGN KEY(interview_id) REFERENCES interviews(id)
+    )
+    """)
+
+    # Admins
+    db.execute("""
+    CREATE TABLE IF NOT EXISTS admins (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE,
+        password TEXT,
+        created_at TEXT
+    )
+    """)
+
+    # Pre-created Interview Sessions (for Admin generated links)
+    db.execute("""
+    CREATE TABLE IF NOT EXISTS interview_sessions (
+        link_id TEXT PRIMARY KEY,
+        candidate_name TEXT,
+        resume_text TEXT,
+        job_description TEXT,
+        status TEXT DEFAULT 'pending',
+        created_by INTEGER,
+        created_at TEXT
+    )
+    """)
+
+    add_column(db, "answers", "ai_score", "INTEGER")
+    add_column(db, "answers", "ai_feedback", "TEXT")
+    add_column(db, "answers", "ai_keywords", "TEXT")
+    add_column(db, "answers", "corrected_answer", "TEXT")
+    add_column(db, "answers", "scoring_status", "TEXT")  # pending / deferred / done / failed
+    add_column(db, "interviews", "recording_path", "TEXT")
+    add_column(db, "interviews", "profile_text", "TEXT")
+    add_column(db, "interviews", "questions", "TEXT")  # JSON string
+    add_column(db, "interviews", "profile_analysis", "TEXT")  # JSON string
+    add_column(db, "interviews", "evaluation_mode", "TEXT")  # per_answer / batch
+    add_column(db, "interviews", "profile_digest", "TEXT")
+    add_column(db, "interviews", "profile_digest_hash", "TEXT")
+    add_column(db, "interview_sessions", "evaluation_mode", "TEXT")
+    add_column(db, "interview_sessions", "precompute_status", "TEXT")
+    add_column(db, "interview_sessions", "precomputed_source", "TEXT")
+    add_column(db, "interview_sessions", "precomputed_analysis", "TEXT")  # JSON string
+    add_column(db, "interview_sessions", "precomputed_questions", "TEXT")  # JSON string
+    add_column(db, "answers", "answer_hash", "TEXT")
+    add_column(db, "answers", "idempotency_key", "TEXT")
+
+
+def m002_unique_answer_per_question(db: sqlite3.Connection):
+    """One answer per (interview, question) so saves can upsert.
+
+    Collapses the duplicates earlier retries left behind (keeping the newest)
+    before the index exists. This unique index also serves the report query
+    (WHERE interview_id = ? ORDER BY question_id) without a sort.
+    """
+    exists = db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_answers_interview_question'"
+    ).fetchone()
+    if not exists:
+        db.execute("""
+            DELETE FROM answers
+            WHERE interview_id IS NOT NULL AND question_id IS NOT NULL
+              AND id NOT IN (SELECT MAX(id) FROM answers GROUP BY interview_id, question_id)
+        """)
+        db.execute("CREATE UNIQUE INDEX idx_answers_interview_question ON answers(interview_id, question_id)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_answers_idempotency_key ON answers(idempotency_key)")
+
+
+def m003_hot_lookup_indexes(db: sqlite3.Connection):
+    """Indexes for the per-interview score lookups and candidate joins."""
+    # interview_ai_summary: WHERE interview_id = ? AND ai_score IS NOT NULL, answered from the index alone
+    db.execute("CREATE INDEX IF NOT EXISTS idx_answers_interview_score ON answers(interview_id, ai_score)")
+    # Startup re-queues pending scoring jobs
+    db.execute("CREATE INDEX IF NOT EXISTS idx_answers_scoring_status ON answers(scoring_status)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_interviews_candidate ON interviews(candidate_id)")
+
+
+def m004_interview_questions(db: sqlite3.Connection):
+    """Questions as rows instead of the interviews.questions JSON blob.
+
+    position is a REAL so a follow-up can be slotted between two questions
+    without touching the others; uid never changes. The ordinal "id" the API
+    exposes is the rank by position. Existing blobs are copied over in list
+    order (the legacy column is left in place, no longer written).
+    """
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS interview_questions (
+            uid INTEGER PRIMARY KEY AUTOINCREMENT,
+            interview_id TEXT NOT NULL,
+            position REAL NOT NULL,
+            data TEXT NOT NULL,  -- question dict (JSON) without its ordinal id
+            created_at TEXT,
+            FOREIGN KEY(interview_id) REFERENCES interviews(id)
+        )
+    """)
+    db.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_interview_questions_position ON interview_questions(interview_id, position)")
+
+    now = datetime.now().isoformat()
+    for interview_id, blob in db.execute("SELECT id, questions FROM interviews WHERE questions IS NOT NULL").fetchall():
+        try:
+            questions = json.loads(blob)
+        except ValueError:
+            print(f"⚠️ Skipping unreadable questions of interview {interview_id}")
+            continue
+        db.executemany(
+            "INSERT INTO interview_questions (interview_id, position, data, created_at) VALUES (?, ?, ?, ?)",
+            [
+                (interview_id, float(i), json.dumps({k: v for k, v in q.items() if k != "id"}), now)
+                for i, q in enumerate(questions or [], 1) if isinstance(q, dict)
+            ]
+        )
+
+
+def m005_interview_candidate_name(db: sqlite3.Connection):
+    """Keep the candidate's name with the interview so a rehydrated session has it."""
+    add_column(db, "interviews", "candidate_name", "TEXT")
+
+
+MIGRATIONS = [
+    (1, "base schema", m001_base_schema),
+    (2, "unique answer per question", m002_unique_answer_per_question),
+    (3, "hot lookup indexes", m003_hot_lookup_indexes),
+    (4, "interview questions table", m004_interview_questions),
+    (5, "interview candidate name", m005_interview_candidate_name),
+]
+
+
+def applied_versions(db: sqlite3.Connection) -> set:
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT,
+            applied_at TEXT
+        )
+    """)
+    return {row[0] for row in db.execute("SELECT version FROM schema_migrations")}
+
+
+def run_migrations(db: sqlite3.Connection) -> list:
+    """Apply pending migrations in order; returns the versions applied now.
+
+    The caller holds the write transaction, so a failing step leaves the
+    schema (and schema_migrations) as it was.
+    """
+    done = applied_versions(db)
+    applied = []
+    for version, name, migrate in MIGRATIONS:
+        if version in done:
+            continue
+        migrate(db)
+        db.execute(
+            "INSERT INTO schema_migrations (version, name, applied_at) VALUES (?, ?, ?)",
+            (version, name, datetime.now().isoformat())
+        )
+        applied.append(version)
+        print(f"🗄️ Applied migration {version:03d}: {name}")
+    return applied
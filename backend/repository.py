@@ -0,0 +1,515 @@
+import os
+import json
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple, TypedDict
+
+from database import execute, query_one, query_all, transaction
+
+# 🔹 Every query the API makes, as typed functions. Calling one returns a
+# coroutine that runs on the DB executor (each of its threads holds its own
+# connection), so async routes never wait on disk I/O or a commit's fsync on
+# the event loop. Code that is already off the loop (sync routes, LLM/worker
+# threads, other repository functions) calls fn.blocking(...) instead.
+DB_THREADS = int(os.getenv("DB_THREADS", "4"))
+
+_db_executor = ThreadPoolExecutor(max_workers=DB_THREADS, thread_name_prefix="db")
+
+
+async def run_db(fn, *args, **kwargs):
+    """Run a blocking function that touches the database on the DB executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, functools.partial(fn, *args, **kwargs))
+
+
+def db_call(fn):
+    @functools.wraps(fn)
+    async def call(*args, **kwargs):
+        return await run_db(fn, *args, **kwargs)
+    call.blocking = fn
+    return call
+
+
+class InterviewRecord(TypedDict):
+    id: str
+    source: str
+    profile_text: Optional[str]
+    profile_analysis: Optional[Dict]
+    created_at: str
+    evaluation_mode: Optional[str]
+    candidate_name: Optional[str]
+    profile_digest: Optional[str]
+    profile_digest_hash: Optional[str]
+
+
+class StoredAnswer(TypedDict):
+    id: int
+    answer_hash: Optional[str]
+    idempotency_key: Optional[str]
+    scoring_status: Optional[str]
+    ai_score: Optional[int]
+    ai_feedback: Optional[str]
+    ai_keywords: Optional[str]
+    corrected_answer: Optional[str]
+
+
+class AnswerScore(TypedDict):
+    answer_id: int
+    scoring_status: str
+    ai_score: Optional[int]
+    ai_feedback: Optional[str]
+    ai_keywords: Optional[str]
+    corrected_answer: Optional[str]
+
+
+class SessionRecord(TypedDict):
+    link_id: str
+    candidate_name: str
+    resume_text: str
+    job_description: str
+    status: str
+    evaluation_mode: Optional[str]
+    precompute_status: Optional[str]
+    precomputed_source: Optional[str]
+    precomputed_analysis: Optional[Dict]
+    precomputed_questions: Optional[List[Dict]]
+
+
+def format_keywords(keywords) -> str:
+    # Prepare keywords (handle list or string)
+    if isinstance(keywords, list):
+        return ",".join(keywords)
+    return str(keywords)
+
+
+def _dumps(value) -> Optional[str]:
+    return json.dumps(value) if value is not None else None
+
+
+def _loads(value):
+    return json.loads(value) if value else None
+
+
+# 🔹 Candidates
+
+@db_call
+def get_or_create_candidate(name: str) -> int:
+    row = query_one("SELECT id FROM candidates WHERE name = ?", (name,))
+    if row:
+        return row[0]
+    return execute(
+        "INSERT INTO candidates (name, created_at) VALUES (?, ?)",
+        (name, datetime.now().isoformat())
+    ).lastrowid
+
+
+# 🔹 Interviews
+
+@db_call
+def create_interview(interview_id: str, source: str, profile_text: str, profile_analysis: Optional[Dict],
+                     questions: List[Dict], evaluation_mode: Optional[str] = None, candidate_name: Optional[str] = None):
+    with transaction() as db:
+        db.execute("""
+            INSERT INTO interviews (id, source, profile_text, profile_analysis, evaluation_mode, candidate_name, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (
+            interview_id,
+            source,
+            profile_text,
+            _dumps(profile_analysis),
+            evaluation_mode,
+            candidate_name,
+            datetime.now().isoformat()
+        ))
+        now = datetime.now().isoformat()
+        db.executemany(
+            "INSERT INTO interview_questions (interview_id, position, data, created_at) VALUES (?, ?, ?, ?)",
+            [(interview_id, float(i), _question_data(q), now) for i, q in enumerate(questions, 1)]
+        )
+
+
+@db_call
+def get_interview(interview_id: str) -> Optional[InterviewRecord]:
+    row = query_one("""
+        SELECT source, profile_text, profile_analysis, created_at,
+               evaluation_mode, candidate_name, profile_digest, profile_digest_hash
+        FROM interviews WHERE id = ?
+    """, (interview_id,))
+    if not row:
+        return None
+    return InterviewRecord(
+        id=interview_id,
+        source=row[0],
+        profile_text=row[1],
+        profile_analysis=_loads(row[2]),
+        created_at=row[3],
+        evaluation_mode=row[4],
+        candidate_name=row[5],
+        profile_digest=row[6],
+        profile_digest_hash=row[7]
+    )
+
+
+@db_call
+def get_profile_analysis_json(interview_id: str) -> Optional[str]:
+    """The stored analysis as JSON text (callers that cache on it compare the raw string)."""
+    row = query_one("SELECT profile_analysis FROM interviews WHERE id = ?", (interview_id,))
+    return row[0] if row else None
+
+
+@db_call
+def save_profile_analysis(interview_id: str, profile_analysis: Optional[Dict]):
+    execute("UPDATE interviews SET profile_analysis = ? WHERE id = ?", (json.dumps(profile_analysis), interview_id))
+
+
+@db_call
+def save_profile_digest(interview_id: str, digest: str, digest_hash: str):
+    execute(
+        "UPDATE interviews SET profile_digest = ?, profile_digest_hash = ? WHERE id = ?",
+        (digest, digest_hash, interview_id)
+    )
+
+
+@db_call
+def save_recording_path(interview_id: str, file_path: str):
+    execute("UPDATE interviews SET recording_path = ? WHERE id = ?", (file_path, interview_id))
+
+
+# 🔹 Interview questions. One row each, ordered by a fractional position; the
+# ordinal "id" clients use is the rank, so inserting a follow-up renumbers the
+# questions after it without rewriting them.
+
+def _question_data(question: Dict) -> str:
+    return json.dumps({k: v for k, v in question.items() if k not in ("id", "uid")})
+
+
+def _question(uid: int, data: str, ordinal: int) -> Dict:
+    return {**json.loads(data), "id": ordinal, "uid": uid}
+
+
+@db_call
+def get_question(interview_id: str, ordinal: int) -> Tuple[Optional[Dict], int]:
+    """(question at this 1-based ordinal or None, total questions in the interview).
+
+    The API's question ids are ranks over position, so this is not a point
+    lookup: COUNT and the rank walk each scan the interview's entries in the
+    covering (interview_id, position) index, O(questions) index entries, and
+    only the matching row is read from the table. Storing ordinals would make
+    it O(1) but bring back rewriting every later question on each follow-up.
+    """
+    total = query_one("SELECT COUNT(*) FROM interview_questions WHERE interview_id = ?", (interview_id,))[0]
+    if not 1 <= ordinal <= total:
+        return None, total
+    # uid is the rowid, so the walk to the ordinal reads the index alone
+    row = query_one(
+        "SELECT uid FROM interview_questions WHERE interview_id = ? ORDER BY position LIMIT 1 OFFSET ?",
+        (interview_id, ordinal - 1)
+    )
+    if not row:
+        return None, total
+    data = query_one("SELECT data FROM interview_questions WHERE uid = ?", (row[0],))
+    return (_question(row[0], data[0], ordinal) if data else None), total
+
+
+@db_call
+def list_questions(interview_id: str) -> List[Dict]:
+    rows = query_all("SELECT uid, data FROM interview_questions WHERE interview_id = ? ORDER BY position", (interview_id,))
+    return [_question(uid, data, ordinal) for ordinal, (uid, data) in enumerate(rows, 1)]
+
+
+def _renumber_questions(db, interview_id: str):
+    # Positions ran out of float precision between two questions: spread them out again.
+    # Negated first so the unique (interview_id, position) index never sees a clash.
+    uids = [row[0] for row in db.execute(
+        "SELECT uid FROM interview_questions WHERE interview_id = ? ORDER BY position", (interview_id,)
+    )]
+    db.executemany("UPDATE interview_questions SET position = ? WHERE uid = ?", [(-float(i), uid) for i, uid in enumerate(uids, 1)])
+    db.execute("UPDATE interview_questions SET position = -position WHERE interview_id = ?", (interview_id,))
+
+
+@db_call
+def insert_question_after(interview_id: str, ordinal: int, question: Dict) -> Optional[Dict]:
+    """Slot a question in right after the one at `ordinal`; None if there is no such question."""
+    if ordinal < 1:
+        return None
+    with transaction() as db:
+        for _ in range(2):
+            rows = db.execute(
+                "SELECT position FROM interview_questions WHERE interview_id = ? ORDER BY position LIMIT 2 OFFSET ?",
+                (interview_id, ordinal - 1)
+            ).fetchall()
+            if not rows:
+                return None
+            after = rows[0][0]
+            before = rows[1][0] if len(rows) > 1 else after + 2
+            position = (after + before) / 2
+            if after < position < before:
+                break
+            _renumber_questions(db, interview_id)
+        cursor = db.execute(
+            "INSERT INTO interview_questions (interview_id, position, data, created_at) VALUES (?, ?, ?, ?)",
+            (interview_id, position, _question_data(question), datetime.now().isoformat())
+        )
+    return {**question, "id": ordinal + 1, "uid": cursor.lastrowid}
+
+
+# 🔹 Answers
+
+ANSWER_COLUMNS = ("id", "answer_hash", "idempotency_key", "scoring_status", "ai_score", "ai_feedback", "ai_keywords", "corrected_answer")
+
+
+@db_call
+def find_answer(interview_id: Optional[str], question_id: Optional[int], idempotency_key: Optional[str] = None) -> Optional[StoredAnswer]:
+    columns = ", ".join(ANSWER_COLUMNS)
+    row = None
+    if idempotency_key:
+        row = query_one(f"SELECT {columns} FROM answers WHERE idempotency_key = ?", (idempotency_key,))
+    if row is None and interview_id is not None and question_id is not None:
+        row = query_one(f"SELECT {columns} FROM answers WHERE interview_id = ? AND question_id = ?", (interview_id, question_id))
+    if row is None:
+        return None
+    return StoredAnswer(zip(ANSWER_COLUMNS, row))
+
+
+@db_call
+def upsert_answer(interview_id, question_id, question_text, answer_text, answer_hash,
+                  idempotency_key, scoring_status, ai_result: Optional[Dict] = None) -> int:
+    ai_result = ai_result or {}
+    with transaction() as db:
+        cursor = db.execute("""
+            INSERT INTO answers (
+                interview_id, question_id, question_text, answer_text, answer_hash, idempotency_key,
+                ai_score, ai_feedback, ai_keywords, corrected_answer, scoring_status, created_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(interview_id, question_id) DO UPDATE SET
+                question_text = excluded.question_text,
+                answer_text = excluded.answer_text,
+                answer_hash = excluded.answer_hash,
+                idempotency_key = COALESCE(excluded.idempotency_key, answers.idempotency_key),
+                ai_score = excluded.ai_score,
+                ai_feedback = excluded.ai_feedback,
+                ai_keywords = excluded.ai_keywords,
+                corrected_answer = excluded.corrected_answer,
+                scoring_status = excluded.scoring_status,
+                created_at = excluded.created_at
+        """, (
+            interview_id,
+            question_id,
+            question_text,
+            answer_text,
+            answer_hash,
+            idempotency_key,
+            ai_result.get("overall_score") if ai_result else None,
+            ai_result.get("feedback", "No feedback") if ai_result else None,
+            format_keywords(ai_result.get("keywords", [])) if ai_result else None,
+            ai_result.get("corrected_answer", "") if ai_result else None,
+            scoring_status,
+            datetime.now().isoformat()
+        ))
+        answer_id = cursor.lastrowid
+        if interview_id is not None and question_id is not None:
+            # lastrowid isn't reliable when the upsert took the UPDATE branch
+            answer_id = db.execute("SELECT id FROM answers WHERE interview_id = ? AND question_id = ?", (interview_id, question_id)).fetchone()[0]
+    return answer_id
+
+
+@db_call
+def save_answer_score(answer_id: int, answer_hash: str, ai_result: Dict):
+    # Only write if the row still holds the answer that was scored (it may have been re-submitted)
+    execute("""
+        UPDATE answers
+        SET ai_score = ?, ai_feedback = ?, ai_keywords = ?, corrected_answer = ?, scoring_status = 'done'
+        WHERE id = ? AND answer_hash = ?
+    """, (
+        ai_result.get("overall_score", 0),
+        ai_result.get("feedback", "No feedback"),
+        format_keywords(ai_result.get("keywords", [])),
+        ai_result.get("corrected_answer", ""),
+        answer_id,
+        answer_hash
+    ))
+
+
+@db_call
+def mark_answer_failed(answer_id: int, answer_hash: str):
+    execute("UPDATE answers SET scoring_status = 'failed' WHERE id = ? AND answer_hash = ?", (answer_id, answer_hash))
+
+
+@db_call
+def save_batch_scores(scored: List[Tuple[int, Dict]]):
+    """Write every (answer_id, result) back in a single transaction."""
+    with transaction() as db:
+        db.executemany("""
+            UPDATE answers
+            SET ai_score = ?, ai_feedback = ?, ai_keywords = ?, corrected_answer = ?, scoring_status = 'done'
+            WHERE id = ?
+        """, [
+            (
+                result.get("overall_score", 0),
+                result.get("feedback", "No feedback"),
+                format_keywords(result.get("keywords", [])),
+                result.get("corrected_answer", ""),
+                answer_id
+            )
+            for answer_id, result in scored
+        ])
+
+
+@db_call
+def read_answer_score(answer_id: int) -> Optional[AnswerScore]:
+    row = query_one("""
+        SELECT scoring_status, ai_score, ai_feedback, ai_keywords, corrected_answer
+        FROM answers WHERE id = ?
+    """, (answer_id,))
+    if not row:
+        return None
+    return AnswerScore(
+        answer_id=answer_id,
+        # Rows saved before background scoring existed were always scored inline
+        scoring_status=row[0] or "done",
+        ai_score=row[1],
+        ai_feedback=row[2],
+        ai_keywords=row[3],
+        corrected_answer=row[4]
+    )
+
+
+@db_call
+def answers_to_evaluate(interview_id: str, rescore: bool = False) -> List[Tuple[int, str, str]]:
+    """(id, question_text, answer_text) of the deferred answers (all of them when rescoring)."""
+    if rescore:
+        return query_all("""
+            SELECT id, question_text, answer_text FROM answers
+            WHERE interview_id = ? ORDER BY question_id ASC
+        """, (interview_id,))
+    return query_all("""
+        SELECT id, question_text, answer_text FROM answers
+        WHERE interview_id = ? AND scoring_status = 'deferred'
+        ORDER BY question_id ASC
+    """, (interview_id,))
+
+
+@db_call
+def pending_answers() -> List[Tuple[int, str, int, str, str]]:
+    """(id, interview_id, question_id, question_text, answer_text) still waiting to be scored."""
+    return query_all("SELECT id, interview_id, question_id, question_text, answer_text FROM answers WHERE scoring_status = 'pending'")
+
+
+@db_call
+def interview_answers(interview_id: str) -> Dict[str, Dict]:
+    """Stored answers keyed by question id, for the interview summary."""
+    rows = query_all("""
+        SELECT question_id, question_text, answer_text, scoring_status, ai_score
+        FROM answers WHERE interview_id = ? ORDER BY question_id ASC
+    """, (interview_id,))
+    return {
+        str(row[0]): {"question": row[1], "answer": row[2], "scoring_status": row[3] or "done", "ai_score": row[4]}
+        for row in rows
+    }
+
+
+@db_call
+def answer_scores(interview_id: str) -> List[int]:
+    rows = query_all("""
+        SELECT ai_score FROM answers
+        WHERE interview_id = ? AND ai_score IS NOT NULL
+    """, (interview_id,))
+    return [row[0] for row in rows]
+
+
+@db_call
+def report_answers(interview_id: str) -> List[Tuple]:
+    """(question_text, answer_text, ai_score, ai_feedback, corrected_answer) in question order."""
+    return query_all("""
+        SELECT question_text, answer_text, ai_score, ai_feedback, corrected_answer
+        FROM answers
+        WHERE interview_id = ?
+        ORDER BY question_id ASC
+    """, (interview_id,))
+
+
+# 🔹 Admin-created interview sessions
+
+@db_call
+def create_session(link_id: str, candidate_name: str, resume_text: str, job_description: str,
+                   evaluation_mode: str, created_by: int):
+    execute(
+        """INSERT INTO interview_sessions
+           (link_id, candidate_name, resume_text, job_description, evaluation_mode, created_by, created_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        (link_id, candidate_name, resume_text, job_description, evaluation_mode, created_by, datetime.now().isoformat())
+    )
+
+
+@db_call
+def get_session(link_id: str) -> Optional[SessionRecord]:
+    row = query_one("""
+        SELECT candidate_name, resume_text, job_description, status, evaluation_mode,
+               precompute_status, precomputed_source, precomputed_analysis, precomputed_questions
+        FROM interview_sessions WHERE link_id = ?
+    """, (link_id,))
+    if not row:
+        return None
+    return SessionRecord(
+        link_id=link_id,
+        candidate_name=row[0],
+        resume_text=row[1],
+        job_description=row[2],
+        status=row[3],
+        evaluation_mode=row[4],
+        precompute_status=row[5],
+        precomputed_source=row[6],
+        precomputed_analysis=_loads(row[7]),
+        precomputed_questions=_loads(row[8])
+    )
+
+
+@db_call
+def set_precompute_status(link_id: str, status: str):
+    execute("UPDATE interview_sessions SET precompute_status = ? WHERE link_id = ?", (status, link_id))
+
+
+@db_call
+def save_precomputed(link_id: str, source: str, profile_analysis: Optional[Dict], questions: List[Dict]):
+    execute("""
+        UPDATE interview_sessions
+        SET precompute_status = 'ready', precomputed_source = ?, precomputed_analysis = ?, precomputed_questions = ?
+        WHERE link_id = ?
+    """, (source, json.dumps(profile_analysis), json.dumps(questions), link_id))
+
+
+@db_call
+def sessions_to_precompute() -> List[str]:
+    rows = query_all("SELECT link_id FROM interview_sessions WHERE precompute_status IN ('queued', 'running')")
+    return [row[0] for row in rows]
+
+
+@db_call
+def start_session(link_id: str, interview_id: str, source: str, profile_text: str,
+                  profile_analysis: Optional[Dict], questions: List[Dict], evaluation_mode: str, candidate_name: str):
+    """Store the session's interview and mark the session started, atomically."""
+    with transaction():
+        create_interview.blocking(interview_id, source, profile_text, profile_analysis, questions, evaluation_mode, candidate_name)
+        execute("UPDATE interview_sessions SET status = 'started' WHERE link_id = ?", (link_id,))
+
+
+# 🔹 Admins
+
+@db_call
+def find_admin(username: str, password_hash: str) -> Optional[Tuple[int, str]]:
+    return query_one("SELECT id, username FROM admins WHERE username = ? AND password = ?", (username, password_hash))
+
+
+@db_call
+def ensure_admin(username: str, password_hash: str) -> bool:
+    """Create the admin unless it exists; True when it was created."""
+    if query_one("SELECT 1 FROM admins WHERE username = ?", (username,)):
+        return False
+    execute(
+        "INSERT INTO admins (username, password, created_at) VALUES (?, ?, ?)",
+        (username, password_hash, datetime.now().isoformat())
+    )
+    return True
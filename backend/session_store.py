@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+
+# 🔹 Live interview sessions (profile text, analysis, digest, evaluation mode)
+# kept in RAM for the hot endpoints. Bounded by count with LRU eviction, and
+# sessions idle longer than the TTL are dropped, so memory stays flat however
+# long the server runs. Anything not in RAM (evicted, or created before a
+# restart) is rehydrated from SQLite on first use, by every endpoint alike.
+SESSION_CACHE_MAX_ITEMS = int(os.getenv("SESSION_CACHE_MAX_ITEMS", "1000"))
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", str(2 * 3600)))
+
+
+def session_size(session: dict) -> int:
+    # Serialized size: a stable stand-in for what the session holds in RAM
+    return len(json.dumps(session, default=str))
+
+
+class SessionStore:
+    """LRU + idle-TTL cache of sessions in front of a repository loader.
+
+    `loader` is a repository function (awaitable, with a `.blocking` variant)
+    returning the session dict for an id, or None when it doesn't exist.
+    """
+
+    def __init__(self, loader, max_items: int = SESSION_CACHE_MAX_ITEMS,
+                 idle_ttl: float = SESSION_IDLE_TTL, clock=time.monotonic):
+        self.loader = loader
+        self.max_items = max_items
+        self.idle_ttl = idle_ttl
+        self.clock = clock
+        self.memory_bytes = 0
+
+        self._lock = threading.Lock()
+        self._items = OrderedDict()  # id -> [last_used, size, session]
+        self.counters = {"hits": 0, "misses": 0, "rehydrated": 0, "not_found": 0, "evictions": 0, "expired": 0}
+
+    def _expire(self, now: float):
+        # Least recently used first, so stop at the first one still within the TTL
+        while self._items and self.idle_ttl > 0:
+            interview_id, (last_used, _, _) = next(iter(self._items.items()))
+            if now - last_used <= self.idle_ttl:
+                break
+            self._drop(interview_id)
+            self.counters["expired"] += 1
+
+    def _drop(self, interview_id: str):
+        entry = self._items.pop(interview_id, None)
+        if entry:
+            self.memory_bytes -= entry[1]
+
+    def get(self, interview_id: str):
+        """The cached session, or None; never touches the database."""
+        now = self.clock()
+        with self._lock:
+            self._expire(now)
+            entry = self._items.get(interview_id)
+            if not entry:
+                self.counters["misses"] += 1
+                return None
+            entry[0] = now
+            self._items.move_to_end(interview_id)
+            self.counters["hits"] += 1
+            return entry[2]
+
+    def put(self, interview_id: str, session: dict) -> dict:
+        now = self.clock()
+        size = session_size(session)
+        with self._lock:
+            self._drop(interview_id)
+            self._items[interview_id] = [now, size, session]
+            self.memory_bytes += size
+            self._expire(now)
+            while len(self._items) > self.max_items:
+                self._drop(next(iter(self._items)))
+                self.counters["evictions"] += 1
+        return session
+
+    def update(self, interview_id: str, **fields):
+        """Change fields of a cached session (the caller persists them separately)."""
+        with self._lock:
+            entry = self._items.get(interview_id)
+            if not entry:
+                return
+            entry[2].update(fields)
+            size = session_size(entry[2])
+            self.memory_bytes += size - entry[1]
+            entry[1] = size
+
+    def _rehydrated(self, interview_id: str, session):
+        if not session:
+            with self._lock:
+                self.counters["not_found"] += 1
+            return None
+        with self._lock:
+            self.counters["rehydrated"] += 1
+        print(f"🔄 Restoring interview {interview_id} from DB...")
+        return self.put(interview_id, session)
+
+    async def load(self, interview_id: str):
+        """Cached session, else rehydrated from the database; None if it doesn't exist."""
+        session = self.get(interview_id)
+        if session is not None:
+            return session
+        try:
+            session = await self.loader(interview_id)
+        except Exception as e:
+            print(f"⚠️ Restore failed for {interview_id}: {e}")
+            session = None
+        return self._rehydrated(interview_id, session)
+
+    def load_blocking(self, interview_id: str):
+        """load() for sync routes and worker threads."""
+        session = self.get(interview_id)
+        if session is not None:
+            return session
+        try:
+            session = self.loader.blocking(interview_id)
+        except Exception as e:
+            print(f"⚠️ Restore failed for {interview_id}: {e}")
+            session = None
+        return self._rehydrated(interview_id, session)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._expire(self.clock())
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                **self.counters,
+                "hit_rate": round(self.counters["hits"] / lookups, 3) if lookups else 0.0,
+                "items": len(self._items),
+                "max_items": self.max_items,
+                "idle_ttl_seconds": self.idle_ttl,
+                "memory_bytes": self.memory_bytes
+            }
@@ -0,0 +1,40 @@
+import threading
+
+from llm_gateway import submit_llm
+
+# 🔹 Request coalescing: concurrent callers asking for the same key share one
+# in-flight call instead of each paying for their own LLM round-trip.
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> concurrent.futures.Future
+        self.started = 0
+        self.shared = 0
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Return the in-flight Future for `key`, starting `fn` on the LLM pool if there is none.
+
+        Blocking callers use `.result()`; async callers `await asyncio.wrap_future(...)`.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                return future
+            future = submit_llm(fn, *args, **kwargs)
+            self._calls[key] = future
+            self.started += 1
+        future.add_done_callback(lambda f: self._forget(key, f))
+        return future
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = len(self._calls)
+        return {"started": self.started, "shared": self.shared, "in_flight": in_flight}
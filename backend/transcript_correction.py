@@ -0,0 +1,253 @@
+import os
+import re
+import json
+from collections import OrderedDict, defaultdict
+
+# 🔹 Vocabulary-aware transcript correction. Whisper mangles names and
+# technical terms ("cuber netties", "post gress QL"); an index built once per
+# interview from the candidate name and the resume/JD analysis snaps them back.
+# Terms are indexed by the character bigrams of their compact form (lowercase,
+# letters and digits only), and the transcript is scanned with 1..MAX_NGRAM word
+# windows, so multi-word terms and terms split into several words are fixed in
+# one near-linear pass. The same terms feed Whisper's initial_prompt.
+#
+# Plenty of everyday words are one letter away from a short term ("reach" /
+# React, "shift" / Swift), so short terms only match exactly (spacing, case and
+# punctuation aside), a single transcript word that is an ordinary English word
+# is never touched, and only long terms are matched by edit distance, compared
+# on a rough phonetic form so "cuber netties" still finds Kubernetes.
+MAX_NGRAM = 3
+MIN_TERM_LENGTH = 4  # shorter terms ("Go", "C#", "AWS") are prompted but never auto-corrected
+FUZZY_MIN_LENGTH = 8  # shorter terms are corrected on an exact compact match only
+PROMPT_TERMS = 40
+ANALYSIS_TERM_FIELDS = ("skills", "tools_and_technologies", "important_keywords", "domains")
+WORDLIST_PATHS = [os.path.join(os.path.dirname(os.path.abspath(__file__)), "common_words.txt")] + [
+    path for path in os.getenv("TRANSCRIPT_WORDLISTS", "/usr/share/dict/words").split(os.pathsep) if path
+]
+
+
+def compact(text: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", (text or "").lower())
+
+
+def sound_key(key: str) -> str:
+    """Rough phonetic form of a compact key ("cubernetties" -> "kuberneties")."""
+    key = key.replace("ph", "f").replace("ck", "k")
+    key = re.sub(r"c(?=[eiy])", "s", key)
+    key = key.replace("c", "k").replace("q", "k").replace("z", "s")
+    return re.sub(r"(.)\1+", r"\1", key)
+
+
+def load_words(paths) -> set:
+    words = set()
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8", errors="ignore") as f:
+                for line in f:
+                    word = line.strip()
+                    # Capitalized entries of system word lists are proper nouns ("Kafka"), not everyday words
+                    if word.isalpha() and word.islower():
+                        words.add(word)
+        except OSError:
+            continue
+    return words
+
+
+ENGLISH_WORDS = load_words(WORDLIST_PATHS)
+
+
+def is_english_word(key: str) -> bool:
+    """True for a dictionary word or a regular inflection of one ("shifting", "reached")."""
+    if key in ENGLISH_WORDS:
+        return True
+    for suffix in ("ing", "ed", "es", "s", "ly"):
+        stem = key[:-len(suffix)]
+        if key.endswith(suffix) and len(stem) >= 3:
+            if stem in ENGLISH_WORDS or stem + "e" in ENGLISH_WORDS or (stem[-1] == stem[-2] and stem[:-1] in ENGLISH_WORDS):
+                return True
+    return False
+
+
+def edit_distance(a: str, b: str) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def max_distance(length: int) -> int:
+    # Edits tolerated grow with term length; short terms must match exactly
+    if length < FUZZY_MIN_LENGTH:
+        return 0
+    if length <= 12:
+        return 1
+    return 2
+
+
+class NgramIndex:
+    """Inverted index of character bigrams. Candidates that can't be within the
+    edit-distance tolerance (too few shared bigrams, q-gram lemma) are skipped
+    without computing a distance, so most transcript words cost a few dict lookups."""
+
+    def __init__(self):
+        self.entries = []  # (key, value)
+        self.postings = defaultdict(list)
+
+    @staticmethod
+    def grams(key: str) -> set:
+        padded = f"#{key}#"
+        return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+    def add(self, key: str, value):
+        entry_id = len(self.entries)
+        self.entries.append((key, value))
+        for gram in self.grams(key):
+            self.postings[gram].append(entry_id)
+
+    def search(self, key: str, tolerance: int) -> list:
+        """Return [(distance, key, value)] for entries within tolerance, closest first."""
+        grams = self.grams(key)
+        shared = defaultdict(int)
+        for gram in grams:
+            for entry_id in self.postings.get(gram, ()):
+                shared[entry_id] += 1
+
+        matches = []
+        for entry_id, count in shared.items():
+            entry_key, value = self.entries[entry_id]
+            if abs(len(entry_key) - len(key)) > tolerance:
+                continue
+            # Each edit destroys at most two bigrams
+            if count < max(len(grams), len(entry_key) + 1) - 2 * tolerance:
+                continue
+            distance = edit_distance(key, entry_key)
+            if distance <= tolerance:
+                matches.append((distance, entry_key, value))
+        return sorted(matches, key=lambda m: m[0])
+
+
+def analysis_terms(profile_analysis) -> list:
+    terms = []
+    for field in ANALYSIS_TERM_FIELDS:
+        for item in (profile_analysis or {}).get(field) or []:
+            if isinstance(item, str) and 1 < len(item) <= 40:
+                terms.append(item.strip())
+    return terms
+
+
+class CorrectionIndex:
+    def __init__(self, terms, candidate_name: str = ""):
+        name = (candidate_name or "").strip()
+        self.terms = []
+        seen = set()
+        # Name first so it wins the prompt budget; its parts help with "Jon" -> "John Smith" style splits
+        name_terms = [name] + name.split() if name and name.lower() != "candidate" else []
+        for term in name_terms + list(terms):
+            key = compact(term)
+            if key and key not in seen:
+                seen.add(key)
+                self.terms.append(term)
+
+        self.exact = {}  # compact key -> term
+        self.index = NgramIndex()  # sound key -> (term, allowed edits), for terms that may be misspelled
+        names = {compact(t) for t in name_terms}
+        for term in self.terms:
+            key = compact(term)
+            if len(key) < MIN_TERM_LENGTH:
+                continue
+            self.exact.setdefault(key, term)
+            allowed = max_distance(len(key))
+            if key in names:
+                allowed = max(allowed, 1)  # "Jon" -> "John", as fix_name used to do
+            if allowed:
+                self.index.add(sound_key(key), (term, allowed))
+
+    def prompt_terms(self, limit: int = PROMPT_TERMS) -> list:
+        return self.terms[:limit]
+
+    def _fuzzy(self, key: str):
+        """Closest term within its allowed edits of `key`, or None."""
+        for distance, _, (term, allowed) in self.index.search(sound_key(key), max_distance(len(key)) + 1):
+            if distance <= allowed:
+                return term
+        return None
+
+    def _matches(self, key: str) -> bool:
+        return len(key) >= MIN_TERM_LENGTH - 1 and (key in self.exact or self._fuzzy(key) is not None)
+
+    def _match_at(self, words, i):
+        windows = []
+        for n in range(min(MAX_NGRAM, len(words) - i), 0, -1):
+            key = compact("".join(words[i:i + n]))
+            if len(key) < MIN_TERM_LENGTH - 1:
+                continue
+            if n == 1 and is_english_word(key):
+                continue
+            windows.append((n, key))
+
+        # Exact matches first at every size, so a fuzzy window can't swallow
+        # the "a" in "a Kubernetes cluster"; then longest first so "post gress QL" beats "post"
+        for n, key in windows:
+            if key in self.exact:
+                return n, self.exact[key]
+        for n, key in windows:
+            term = self._fuzzy(key)
+            if not term:
+                continue
+            if n > 1:
+                # Short words run together ("an a" -> "ana") are too little to go on
+                if len(key) < MIN_TERM_LENGTH:
+                    continue
+                # The window picked up a neighbouring word if it still matches without
+                # its first or last one ("is sagar" -> Sagar, "I will" -> Will)
+                if self._matches(compact("".join(words[i + 1:i + n]))) or self._matches(compact("".join(words[i:i + n - 1]))):
+                    continue
+            return n, term
+        return None
+
+    def correct(self, text: str) -> str:
+        words = text.split()
+        out = []
+        i = 0
+        while i < len(words):
+            match = self._match_at(words, i)
+            if match:
+                n, term = match
+                trailing = re.search(r"[^\w]*$", words[i + n - 1]).group(0)
+                out.append(term + trailing)
+                i += n
+            else:
+                out.append(words[i])
+                i += 1
+        return " ".join(out)
+
+
+class CorrectionIndexCache:
+    """Per-interview indexes, rebuilt only when the profile analysis changes."""
+
+    def __init__(self, max_items: int = 256):
+        self.max_items = max_items
+        self._items = OrderedDict()  # (interview_id, name) -> (analysis_json, index)
+
+    def get(self, interview_id, candidate_name: str, analysis_json) -> CorrectionIndex:
+        cache_key = (interview_id, candidate_name)
+        entry = self._items.get(cache_key)
+        if entry and entry[0] == analysis_json:
+            self._items.move_to_end(cache_key)
+            return entry[1]
+
+        try:
+            analysis = json.loads(analysis_json) if analysis_json else {}
+        except ValueError:
+            analysis = {}
+        index = CorrectionIndex(analysis_terms(analysis), candidate_name)
+        self._items[cache_key] = (analysis_json, index)
+        self._items.move_to_end(cache_key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+        return index
@@ -1,46 +1,88 @@
-from fastapi import APIRouter, UploadFile, File, Form
-import whisper, tempfile, os
-from difflib import SequenceMatcher
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, WebSocket
+import time
+from typing import Optional
+from repository import get_profile_analysis_json, run_db
+from transcript_correction import CorrectionIndexCache
+from transcription_pool import transcription_pool, TranscriptionQueueFull
+from audio_decode import decode_stream, AudioDecodeError
+from transcription_stream import run_stream
+from transcription_cache import transcript_cache, transcript_key, hash_upload
 
 router = APIRouter()
-model = whisper.load_model("small")
 
-def similarity(a, b):
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+correction_indexes = CorrectionIndexCache()
 
-def fix_name(text, name):
-    words = text.split()
-    for i, w in enumerate(words):
-        if similarity(w, name) > 0.75:
-            words[i] = name
-    return " ".join(words)
+async def get_correction_index(interview_id: Optional[str], candidate_name: str):
+    """Name + resume/JD terms for this interview (rebuilt when its profile analysis changes)."""
+    analysis_json = await get_profile_analysis_json(interview_id) if interview_id else None
+    return correction_indexes.get(interview_id, candidate_name, analysis_json)
+
+def interview_prompt(candidate_name: str, terms=None) -> str:
+    prompt = (
+        f"This is a job interview. "
+        f"The candidate's name is {candidate_name}. "
+        f"Proper nouns and technical terms may appear."
+    )
+    if terms:
+        prompt += f" Terms: {', '.join(terms)}."
+    return prompt
+
+def elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+async def transcribe_upload(upload: UploadFile, initial_prompt: str, timings: Optional[dict] = None):
+    """Upload -> cached transcript, or ffmpeg pipe -> worker pool on a miss.
+
+    Returns (result, from_cache). Stage timings are added to `timings`.
+    """
+    timings = {} if timings is None else timings
+    started = time.perf_counter()
+    key = transcript_key(await hash_upload(upload), initial_prompt)
+    # The cache is backed by SQLite, so lookups and stores run on the DB executor
+    cached = await run_db(transcript_cache.get, key)
+    timings["cache_lookup_ms"] = elapsed_ms(started)
+    if cached is not None:
+        return cached, True
+
+    # Upload -> ffmpeg pipe -> float32 PCM, with no temp file in between
+    started = time.perf_counter()
+    try:
+        samples = await decode_stream(upload)
+    except AudioDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Could not decode audio: {e}")
+    timings["extract_ms"] = elapsed_ms(started)
+
+    started = time.perf_counter()
+    try:
+        # Decoding runs in a worker process, so the event loop stays free
+        result = await transcription_pool.transcribe(samples, initial_prompt=initial_prompt)
+    except TranscriptionQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    timings["transcribe_ms"] = elapsed_ms(started)
+
+    await run_db(transcript_cache.set, key, result)
+    return result, False
 
 @router.post("/transcribe")
 async def transcribe_audio(
     audio: UploadFile = File(...),
-    candidate_name: str = Form(...)
+    candidate_name: str = Form(...),
+    interview_id: Optional[str] = Form(None)
 ):
-    data = await audio.read()
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as f:
-        f.write(data)
-        path = f.name
-
-    result = model.transcribe(
-        path,
-        language="en",
-        task="transcribe",
-        fp16=False,
-        initial_prompt=(
-            f"This is a job interview. "
-            f"The candidate's name is {candidate_name}. "
-            f"Proper nouns and technical terms may appear."
-        )
-    )
+    index = await get_correction_index(interview_id, candidate_name)
+    result, cached = await transcribe_upload(audio, interview_prompt(candidate_name, index.prompt_terms()))
+
+    text = index.correct(result["text"].strip())
 
-    os.remove(path)
+    return {"text": text, "cached": cached}
 
-    text = result["text"].strip()
-    text = fix_name(text, candidate_name)
+@router.websocket("/ws/transcribe")
+async def transcribe_stream(websocket: WebSocket, candidate_name: str = "Candidate", interview_id: Optional[str] = None):
+    """Streaming variant of /transcribe: send recorder chunks as binary frames, then "end"."""
+    await websocket.accept()
+    index = await get_correction_index(interview_id, candidate_name)
+    await run_stream(websocket, interview_prompt(candidate_name, index.prompt_terms()), index.correct)
 
-    return {"text": text}
+@router.get("/transcribe/engine")
+def transcription_engine_info():
+    return {**transcription_pool.stats(), "cache": transcript_cache.stats()}
@@ -0,0 +1,46 @@
+import os
+import hashlib
+
+from llm_cache import ResultCache, CACHE_DB_PATH, make_key
+from transcription_engine import WHISPER_BACKEND, WHISPER_MODEL, WHISPER_VAD
+
+# 🔹 Transcripts keyed by a hash of the uploaded audio bytes plus everything
+# that changes the output (backend, model, VAD, prompt). Flaky networks re-send
+# the same blob and candidates re-submit identical recordings; those now come
+# back from here instead of another Whisper decode.
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+TRANSCRIPT_CACHE_MAX_ROWS = int(os.getenv("TRANSCRIPT_CACHE_MAX_ROWS", "20000"))
+TRANSCRIPT_CACHE_TTL = float(os.getenv("TRANSCRIPT_CACHE_TTL", str(7 * 24 * 3600)))
+TRANSCRIPT_CACHE_PERSIST = os.getenv("TRANSCRIPT_CACHE_PERSIST", "true").lower() in ("1", "true", "yes")
+HASH_CHUNK_SIZE = 256 * 1024
+
+
+async def hash_upload(upload) -> str:
+    """sha256 of an UploadFile's bytes; rewinds it so it can still be decoded."""
+    digest = hashlib.sha256()
+    while True:
+        chunk = await upload.read(HASH_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+    await upload.seek(0)
+    return digest.hexdigest()
+
+
+def transcript_key(audio_hash: str, initial_prompt: str) -> str:
+    return make_key(
+        "transcript",
+        f"{audio_hash}\n{initial_prompt or ''}",
+        f"{WHISPER_BACKEND}:{WHISPER_MODEL}",
+        f"vad={int(WHISPER_VAD)}"
+    )
+
+
+transcript_cache = ResultCache(
+    CACHE_DB_PATH if TRANSCRIPT_CACHE_PERSIST else ":memory:",
+    table="transcript_cache",
+    max_memory_items=100000,  # bounded by bytes instead
+    max_rows=TRANSCRIPT_CACHE_MAX_ROWS,
+    ttl_seconds=TRANSCRIPT_CACHE_TTL,
+    max_memory_bytes=TRANSCRIPT_CACHE_MAX_BYTES
+)
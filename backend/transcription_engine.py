@@ -0,0 +1,228 @@
+import os
+import time
+import threading
+
+from vad import trim_silence, SpeechMap
+
+# 🔹 Speech-to-text engines behind one interface. Nothing heavy is imported or
+# loaded at import time: the model loads on first use, or up front when
+# warm_up() is called (see WHISPER_WARMUP), so workers that never transcribe
+# never pay for it.
+WHISPER_BACKEND = os.getenv("WHISPER_BACKEND", "openai")  # openai / faster
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "small")
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8")  # faster-whisper only
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))  # 0 = library default
+WHISPER_WARMUP = os.getenv("WHISPER_WARMUP", "false").lower() in ("1", "true", "yes")
+WHISPER_VAD = os.getenv("WHISPER_VAD", "true").lower() in ("1", "true", "yes")
+WHISPER_LANGUAGE = "en"
+BATCH_MAX_SECONDS = 30  # one Whisper window; longer clips are decoded on their own
+
+
+class TranscriptionEngine:
+    """Base engine: lazy, thread-safe model loading plus a common transcribe() result.
+
+    `audio` is a file path or a 16 kHz mono float32 NumPy array.
+    transcribe() returns {"text": str, "segments": [{"start", "end", "text"}], "duration": float}.
+    Arrays are trimmed to their speech regions first (WHISPER_VAD); segment
+    times still refer to the original audio and "speech_seconds" is added.
+    """
+
+    name = "base"
+    supports_batching = False  # True when _transcribe_batch does a real batched pass
+
+    def __init__(self, model_size: str = WHISPER_MODEL, device: str = WHISPER_DEVICE):
+        self.model_size = model_size
+        self.device = device
+        self.model = None
+        self.load_seconds = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.model is not None
+
+    def load(self):
+        if self.model is not None:
+            return self.model
+        with self._lock:
+            if self.model is None:
+                started = time.perf_counter()
+                self.model = self._load_model()
+                self.load_seconds = time.perf_counter() - started
+                print(f"✅ {self.name} '{self.model_size}' model loaded in {self.load_seconds:.1f}s")
+        return self.model
+
+    def warm_up(self):
+        """Load the model and run one tiny decode so the first real request isn't slow."""
+        import numpy as np
+        self.load()
+        self._transcribe(np.zeros(16000, dtype=np.float32), None)
+
+    def transcribe(self, audio, initial_prompt: str = None, vad: bool = WHISPER_VAD) -> dict:
+        self.load()
+        if not vad or isinstance(audio, str):
+            return self._transcribe(audio, initial_prompt)
+
+        speech, speech_map = trim_silence(audio)
+        if not speech_map.regions:
+            return speech_map.remap({"text": "", "segments": []})
+        return speech_map.remap(self._transcribe(speech, initial_prompt))
+
+    def transcribe_batch(self, audios, initial_prompt: str = None, vad: bool = WHISPER_VAD) -> list:
+        """Transcribe several arrays with one shared prompt; results are in input order."""
+        self.load()
+        trimmed = [trim_silence(a) if vad else (a, SpeechMap([(0, len(a))], len(a))) for a in audios]
+
+        results = [None] * len(audios)
+        batch = []
+        for i, (speech, speech_map) in enumerate(trimmed):
+            if not speech_map.regions:
+                results[i] = speech_map.remap({"text": "", "segments": []})
+            elif len(speech) > BATCH_MAX_SECONDS * 16000:
+                results[i] = speech_map.remap(self._transcribe(speech, initial_prompt))
+            else:
+                batch.append(i)
+
+        if batch:
+            decoded = self._transcribe_batch([trimmed[i][0] for i in batch], initial_prompt)
+            for i, result in zip(batch, decoded):
+                results[i] = trimmed[i][1].remap(result)
+        return results
+
+    def _load_model(self):
+        raise NotImplementedError
+
+    def _transcribe(self, audio, initial_prompt):
+        raise NotImplementedError
+
+    def _transcribe_batch(self, audios, initial_prompt):
+        return [self._transcribe(audio, initial_prompt) for audio in audios]
+
+    def info(self) -> dict:
+        return {
+            "backend": self.name,
+            "model": self.model_size,
+            "device": self.device,
+            "loaded": self.loaded,
+            "load_seconds": round(self.load_seconds, 2) if self.load_seconds else None
+        }
+
+
+class OpenAIWhisperEngine(TranscriptionEngine):
+    """Reference openai-whisper (PyTorch) implementation."""
+
+    name = "openai-whisper"
+    supports_batching = True
+
+    def _load_model(self):
+        import whisper
+        return whisper.load_model(self.model_size, device=self.device)
+
+    def _transcribe(self, audio, initial_prompt):
+        result = self.model.transcribe(
+            audio,
+            language=WHISPER_LANGUAGE,
+            task="transcribe",
+            fp16=self.device != "cpu",
+            initial_prompt=initial_prompt
+        )
+        segments = [
+            {"start": s["start"], "end": s["end"], "text": s["text"]}
+            for s in result.get("segments", [])
+        ]
+        return {
+            "text": result["text"].strip(),
+            "segments": segments,
+            "duration": segments[-1]["end"] if segments else 0.0
+        }
+
+    def _transcribe_batch(self, audios, initial_prompt):
+        # Pad every clip to one 30 s window and run a single batched encoder/decoder pass
+        import torch
+        import whisper
+        mels = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(audio)), self.model.dims.n_mels)
+            for audio in audios
+        ]).to(self.model.device)
+        options = whisper.DecodingOptions(
+            language=WHISPER_LANGUAGE,
+            task="transcribe",
+            fp16=self.device != "cpu",
+            prompt=initial_prompt,
+            without_timestamps=True
+        )
+        results = []
+        for audio, decoded in zip(audios, whisper.decode(self.model, mels, options)):
+            duration = len(audio) / 16000
+            text = decoded.text.strip()
+            results.append({
+                "text": text,
+                "segments": [{"start": 0.0, "end": duration, "text": text}] if text else [],
+                "duration": duration
+            })
+        return results
+
+
+class FasterWhisperEngine(TranscriptionEngine):
+    """CTranslate2 (faster-whisper) implementation, int8-quantized on CPU by default."""
+
+    name = "faster-whisper"
+
+    def __init__(self, model_size: str = WHISPER_MODEL, device: str = WHISPER_DEVICE,
+                 compute_type: str = WHISPER_COMPUTE_TYPE):
+        super().__init__(model_size, device)
+        self.compute_type = compute_type
+
+    def _load_model(self):
+        from faster_whisper import WhisperModel
+        return WhisperModel(
+            self.model_size,
+            device=self.device,
+            compute_type=self.compute_type,
+            cpu_threads=WHISPER_CPU_THREADS
+        )
+
+    def _transcribe(self, audio, initial_prompt):
+        segments, info = self.model.transcribe(
+            audio,
+            language=WHISPER_LANGUAGE,
+            task="transcribe",
+            beam_size=5,
+            initial_prompt=initial_prompt
+        )
+        # faster-whisper decodes lazily; materialize the generator here
+        segments = [{"start": s.start, "end": s.end, "text": s.text} for s in segments]
+        return {
+            "text": "".join(s["text"] for s in segments).strip(),
+            "segments": segments,
+            "duration": info.duration
+        }
+
+    def info(self) -> dict:
+        return {**super().info(), "compute_type": self.compute_type}
+
+
+ENGINES = {
+    "openai": OpenAIWhisperEngine,
+    "faster": FasterWhisperEngine
+}
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def create_engine(backend: str = WHISPER_BACKEND, model_size: str = WHISPER_MODEL) -> TranscriptionEngine:
+    if backend not in ENGINES:
+        raise ValueError(f"Unknown WHISPER_BACKEND '{backend}' (expected one of: {', '.join(ENGINES)})")
+    return ENGINES[backend](model_size)
+
+
+def get_engine() -> TranscriptionEngine:
+    """Process-wide engine, created on first use (the model itself loads on first transcribe)."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine()
+    return _engine
@@ -0,0 +1,258 @@
+import os
+import time
+import asyncio
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, BrokenExecutor
+
+import transcription_engine
+from transcription_engine import WHISPER_BACKEND, WHISPER_MODEL
+
+# 🔹 Whisper decoding is CPU-bound, so it runs in a pool of worker processes,
+# each holding its own loaded model. Admission is bounded: once every worker is
+# busy and TRANSCRIBE_QUEUE_SIZE jobs are waiting, new requests are rejected
+# (the route answers 503 + Retry-After) instead of piling up.
+TRANSCRIBE_WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+TRANSCRIBE_QUEUE_SIZE = int(os.getenv("TRANSCRIBE_QUEUE_SIZE", "8"))
+
+# Micro-batching: requests arriving within TRANSCRIBE_BATCH_WINDOW_MS of each
+# other share one batched Whisper pass (up to TRANSCRIBE_MAX_BATCH clips).
+# A pass takes a single prompt, so only clips with the same initial_prompt are
+# batched together; a clip with nothing to share a pass with decodes on its own.
+# Off by default: every interview's prompt carries its candidate's name and
+# terms, so clips from different interviews never share a pass and batching
+# would only add the window's wait. Raise it when many clips share a prompt.
+TRANSCRIBE_MAX_BATCH = int(os.getenv("TRANSCRIBE_MAX_BATCH", "1"))
+TRANSCRIBE_BATCH_WINDOW_MS = float(os.getenv("TRANSCRIBE_BATCH_WINDOW_MS", "50"))
+
+
+class TranscriptionQueueFull(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Transcription queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _init_worker(backend: str, model_size: str):
+    # Runs once in each worker process: build and load that worker's model
+    engine = transcription_engine.create_engine(backend, model_size)
+    transcription_engine._engine = engine
+    engine.load()
+
+
+def _transcribe_job(audio, initial_prompt):
+    started = time.perf_counter()
+    result = transcription_engine.get_engine().transcribe(audio, initial_prompt=initial_prompt)
+    return result, time.perf_counter() - started
+
+
+def _transcribe_batch_job(audios, initial_prompt):
+    started = time.perf_counter()
+    results = transcription_engine.get_engine().transcribe_batch(audios, initial_prompt=initial_prompt)
+    return results, time.perf_counter() - started
+
+
+class TranscriptionPool:
+    """Bounded front door to the transcription workers.
+
+    With workers=0 jobs run on a single in-process thread instead (handy for
+    local development, where spawning model processes isn't worth it).
+    """
+
+    def __init__(self, workers: int = TRANSCRIBE_WORKERS, queue_size: int = TRANSCRIBE_QUEUE_SIZE,
+                 backend: str = WHISPER_BACKEND, model_size: str = WHISPER_MODEL,
+                 max_batch: int = TRANSCRIBE_MAX_BATCH, batch_window_ms: float = TRANSCRIBE_BATCH_WINDOW_MS):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.backend = backend
+        self.model_size = model_size
+        engine_class = transcription_engine.ENGINES.get(backend)
+        # Only batch when the engine can actually decode a batch in one pass
+        self.max_batch = max_batch if engine_class and engine_class.supports_batching else 1
+        self.batch_window = batch_window_ms / 1000
+
+        self._pending = []  # [(audio, initial_prompt, asyncio.Future)] waiting for the current batch window
+        self._flush_handle = None
+        self.batches = 0
+        self.batched_jobs = 0
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.restarts = 0
+        self._wait_ms = deque(maxlen=200)
+        self._run_ms = deque(maxlen=200)
+
+    @property
+    def capacity(self) -> int:
+        return max(self.workers, 1) + self.queue_size
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.workers > 0:
+                        # spawn: never fork a process that already runs threads/event loops
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.workers,
+                            mp_context=multiprocessing.get_context("spawn"),
+                            initializer=_init_worker,
+                            initargs=(self.backend, self.model_size)
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=1,
+                            thread_name_prefix="transcribe",
+                            initializer=_init_worker,
+                            initargs=(self.backend, self.model_size)
+                        )
+        return self._executor
+
+    def _reset_executor(self, broken):
+        # A dead worker (e.g. OOM-killed) breaks the whole executor for good: drop it
+        # so the next request starts fresh workers instead of failing until a restart
+        with self._lock:
+            if self._executor is not broken:
+                return
+            self._executor = None
+            self.restarts += 1
+        print("⚠️ Transcription worker pool broke; starting new workers on the next request")
+        broken.shutdown(wait=False)
+
+    def warm_up(self):
+        """Start every worker (loading its model) before the first real request."""
+        executor = self._get_executor()
+        futures = [executor.submit(time.sleep, 0.1) for _ in range(max(self.workers, 1))]
+        for future in futures:
+            future.result()
+        print(f"✅ Transcription pool ready ({max(self.workers, 1)} worker(s), {self.backend} '{self.model_size}')")
+
+    def retry_after(self) -> int:
+        avg_run = (sum(self._run_ms) / len(self._run_ms) / 1000) if self._run_ms else 10.0
+        waiting = max(self.in_flight - max(self.workers, 1), 0) + 1
+        return max(1, int(avg_run * waiting / max(self.workers, 1)))
+
+    async def transcribe(self, audio, initial_prompt: str = None, batch: bool = True) -> dict:
+        """Transcribe on a worker; raises TranscriptionQueueFull when saturated.
+
+        Arrays may be micro-batched with concurrent requests that use the same
+        `initial_prompt`; pass batch=False to always decode on its own.
+        """
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise TranscriptionQueueFull(self.retry_after())
+            self.in_flight += 1
+
+        submitted = time.perf_counter()
+        try:
+            if batch and self.max_batch > 1 and not isinstance(audio, str):
+                result, run_seconds = await self._enqueue(audio, initial_prompt)
+            else:
+                executor = self._get_executor()
+                try:
+                    result, run_seconds = await asyncio.wrap_future(executor.submit(_transcribe_job, audio, initial_prompt))
+                except BrokenExecutor:
+                    self._reset_executor(executor)
+                    raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        total_ms = (time.perf_counter() - submitted) * 1000
+        self._run_ms.append(run_seconds * 1000)
+        self._wait_ms.append(max(total_ms - run_seconds * 1000, 0.0))
+        self.completed += 1
+        return result
+
+    def _enqueue(self, audio, initial_prompt):
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._pending.append((audio, initial_prompt, waiter))
+        if sum(1 for _, prompt, _ in self._pending if prompt == initial_prompt) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return waiter
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+
+        groups = {}  # initial_prompt -> [(audio, waiter)], in arrival order
+        for audio, initial_prompt, waiter in pending:
+            groups.setdefault(initial_prompt, []).append((audio, waiter))
+        for initial_prompt, jobs in groups.items():
+            for start in range(0, len(jobs), self.max_batch):
+                self._submit(jobs[start:start + self.max_batch], initial_prompt)
+
+    def _submit(self, jobs, initial_prompt):
+        executor = None
+        try:
+            executor = self._get_executor()
+            if len(jobs) == 1:
+                # Nothing to share a pass with: a plain decode, no padding to a batch window
+                future = executor.submit(_transcribe_job, jobs[0][0], initial_prompt)
+            else:
+                self.batches += 1
+                self.batched_jobs += len(jobs)
+                future = executor.submit(_transcribe_batch_job, [audio for audio, _ in jobs], initial_prompt)
+        except Exception as e:
+            # Runs from a loop callback: hand the error to the waiting requests or they hang
+            future = Future()
+            future.set_exception(e)
+
+        def deliver(done):
+            error = done.exception()
+            if isinstance(error, BrokenExecutor):
+                self._reset_executor(executor)
+            for i, (_, waiter) in enumerate(jobs):
+                if waiter.done():
+                    continue
+                if error:
+                    waiter.set_exception(error)
+                else:
+                    result, run_seconds = done.result()
+                    waiter.set_result((result[i] if len(jobs) > 1 else result, run_seconds))
+        asyncio.wrap_future(future).add_done_callback(deliver)
+
+    def stats(self) -> dict:
+        def pct(values, p):
+            if not values:
+                return None
+            ordered = sorted(values)
+            return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 1)
+
+        return {
+            "backend": self.backend,
+            "model": self.model_size,
+            "workers": self.workers,
+            "started": self._executor is not None,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "running": min(self.in_flight, max(self.workers, 1)),
+            "queued": max(self.in_flight - max(self.workers, 1), 0),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+            "max_batch": self.max_batch,
+            "batch_window_ms": self.batch_window * 1000,
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_jobs / self.batches, 2) if self.batches else None,
+            "queue_wait_ms_p50": pct(self._wait_ms, 50),
+            "queue_wait_ms_p95": pct(self._wait_ms, 95),
+            "run_ms_p50": pct(self._run_ms, 50),
+            "run_ms_p95": pct(self._run_ms, 95)
+        }
+
+
+transcription_pool = TranscriptionPool()
@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import asyncio
+
+from audio_decode import SAMPLE_RATE, spawn_ffmpeg, pcm_to_float32, AudioDecodeError
+from transcription_pool import transcription_pool, TranscriptionQueueFull
+
+# 🔹 Incremental transcription for /ws/transcribe. Recorder chunks (Opus/WebM
+# timeslices) go into one long-lived ffmpeg process; its PCM output grows a
+# buffer that is re-transcribed over a sliding window. Text older than the
+# window is committed and never decoded again, so the final transcript only
+# has to decode the last few seconds after the candidate stops.
+STREAM_WINDOW_SECONDS = float(os.getenv("STREAM_WINDOW_SECONDS", "15"))
+STREAM_PARTIAL_INTERVAL = float(os.getenv("STREAM_PARTIAL_INTERVAL", "1.0"))  # new audio (s) between partials
+STREAM_COMMIT_MARGIN = 1.0  # keep the last second uncommitted; words there may still change
+PCM_BYTES_PER_SAMPLE = 2
+
+
+class StreamingTranscription:
+    def __init__(self, initial_prompt: str, pool=transcription_pool):
+        self.initial_prompt = initial_prompt
+        self.pool = pool
+        self.pcm = bytearray()
+        self.offset = 0           # first sample not yet committed
+        self.decoded_upto = 0     # buffer length (samples) at the last decode
+        self.committed = []
+        self.hypothesis = ""
+        self.decodes = 0
+        self._process = None
+        self._reader = None
+        self._decode_lock = asyncio.Lock()
+
+    @property
+    def samples(self) -> int:
+        return len(self.pcm) // PCM_BYTES_PER_SAMPLE
+
+    @property
+    def audio_seconds(self) -> float:
+        return self.samples / SAMPLE_RATE
+
+    @property
+    def text(self) -> str:
+        return " ".join(part for part in self.committed + [self.hypothesis] if part).strip()
+
+    async def start(self):
+        self._process = await spawn_ffmpeg()
+        self._reader = asyncio.create_task(self._read_pcm())
+
+    async def _read_pcm(self):
+        while True:
+            chunk = await self._process.stdout.read(64 * 1024)
+            if not chunk:
+                break
+            self.pcm.extend(chunk)
+
+    async def feed(self, chunk: bytes):
+        try:
+            self._process.stdin.write(chunk)
+            await self._process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg gave up on the input; finish() transcribes what was decoded
+
+    def partial_due(self) -> bool:
+        return (
+            not self._decode_lock.locked()
+            and self.samples - self.decoded_upto >= STREAM_PARTIAL_INTERVAL * SAMPLE_RATE
+        )
+
+    async def partial(self):
+        """Re-decode the current window; returns the updated text, or None if skipped."""
+        try:
+            await self._decode(final=False)
+        except TranscriptionQueueFull:
+            return None  # workers are saturated; the final pass still gets the audio
+        return self.text
+
+    async def finish(self) -> str:
+        """Flush ffmpeg, decode whatever is not committed yet and return the final text."""
+        self._process.stdin.close()
+        await self._reader
+        await self._process.wait()
+        await self._decode(final=True)
+        return self.text
+
+    async def close(self):
+        if self._process and self._process.returncode is None:
+            self._process.kill()
+            await self._process.wait()
+        if self._reader:
+            self._reader.cancel()
+
+    async def _decode(self, final: bool):
+        async with self._decode_lock:
+            end = self.samples
+            if end <= self.offset:
+                self.hypothesis = ""
+                return
+            window = pcm_to_float32(bytes(self.pcm[self.offset * PCM_BYTES_PER_SAMPLE:end * PCM_BYTES_PER_SAMPLE]))
+            # Condition on the committed tail so the window continues the sentence
+            prompt = " ".join([self.initial_prompt] + self.committed)[-800:]
+            result = await self.pool.transcribe(window, initial_prompt=prompt, batch=False)
+            self.decodes += 1
+            self.decoded_upto = end
+
+            text = result["text"].strip()
+            if final:
+                self.committed.append(text)
+                self.offset = end
+                self.hypothesis = ""
+                return
+
+            segments = result.get("segments") or []
+            window_seconds = (end - self.offset) / SAMPLE_RATE
+            if segments and window_seconds > STREAM_WINDOW_SECONDS:
+                # Commit finished segments so the window slides forward
+                stable = [s for s in segments if s["end"] <= window_seconds - STREAM_COMMIT_MARGIN]
+                if stable:
+                    self.committed.append("".join(s["text"] for s in stable).strip())
+                    self.offset += int(stable[-1]["end"] * SAMPLE_RATE)
+                    text = "".join(s["text"] for s in segments[len(stable):]).strip()
+            self.hypothesis = text
+
+
+def is_end_message(text: str) -> bool:
+    text = (text or "").strip()
+    if text.lower() == "end":
+        return True
+    try:
+        return json.loads(text).get("type") == "end"
+    except (ValueError, AttributeError):
+        return False
+
+
+async def run_stream(websocket, initial_prompt: str, postprocess=lambda text: text):
+    """Drive one /ws/transcribe connection.
+
+    Client sends binary audio chunks, then "end" (or {"type": "end"}).
+    Server sends {"type": "partial"} updates and one {"type": "final"}.
+    """
+    stream = StreamingTranscription(initial_prompt)
+    try:
+        await stream.start()
+    except AudioDecodeError as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1011)
+        return
+    partial_task = None
+
+    async def send_partial():
+        text = await stream.partial()
+        if text is not None:
+            await websocket.send_json({"type": "partial", "text": postprocess(text), "audio_seconds": round(stream.audio_seconds, 2)})
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes"):
+                await stream.feed(message["bytes"])
+                if stream.partial_due() and (partial_task is None or partial_task.done()):
+                    partial_task = asyncio.create_task(send_partial())
+            elif is_end_message(message.get("text")):
+                break
+
+        ended_at = time.perf_counter()
+        if partial_task:
+            await partial_task
+        try:
+            text = await stream.finish()
+        except TranscriptionQueueFull as e:
+            await websocket.send_json({"type": "error", "detail": str(e), "retry_after": e.retry_after})
+            await websocket.close(code=1013)  # try again later
+            return
+        await websocket.send_json({
+            "type": "final",
+            "text": postprocess(text),
+            "audio_seconds": round(stream.audio_seconds, 2),
+            "decodes": stream.decodes,
+            "finalize_ms": round((time.perf_counter() - ended_at) * 1000, 1)
+        })
+        await websocket.close()
+    finally:
+        await stream.close()
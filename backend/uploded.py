@@ -1,26 +1,32 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from openai import OpenAI
+from fastapi.responses import JSONResponse, StreamingResponse
 import os
-import tempfile
 from pydantic import BaseModel
-from analyze_answer import analyze_answer
+from analyze_answer import analyze_answer, analyze_answers_batch
+from llm_gateway import chat_completion, extract_json, run_llm, submit_llm, breaker, LLMUnavailable
+from llm_cache import llm_cache, make_key
+from job_queue import JobQueue
+from single_flight import SingleFlight
 import shutil
 from datetime import datetime
 from typing import List, Dict, Optional
 import json
 import uuid
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from difflib import SequenceMatcher
 from dotenv import load_dotenv
 import PyPDF2
 from docx import Document
 import io
-import subprocess
-import tempfile
-from openai import OpenAI
-import requests
 from pydantic import BaseModel
-from database import conn, cursor
+import repository
+from repository import run_db, find_answer, upsert_answer, read_answer_score
+from session_store import SessionStore
 from datetime import datetime
 
 
@@ -38,6 +44,14 @@ app = FastAPI()
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 
+# Speech-to-text routes (/transcribe). The Whisper model loads lazily on first use.
+from transcription import router as transcription_router, get_correction_index, interview_prompt, transcribe_upload
+from transcription_engine import WHISPER_WARMUP
+from transcription_pool import transcription_pool
+from transcription_cache import transcript_cache
+app.include_router(transcription_router)
+
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -47,33 +61,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage (replace with database in production)
-interviews = {}
-
-def get_client():
-    load_dotenv()
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
-        print("⚠️ Warning: OPENROUTER_API_KEY not found in environment")
-    return OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=api_key
-    )
+# Live interviews: bounded RAM cache, rehydrated from SQLite on a miss
+live_interviews = SessionStore(repository.get_interview)
 
-def get_or_create_candidate(name: str) -> int:
-    cursor.execute("SELECT id FROM candidates WHERE name = ?", (name,))
-    row = cursor.fetchone()
+def new_session(interview_id: str, source: str, profile_text: str, profile_analysis,
+                evaluation_mode: Optional[str] = None, candidate_name: Optional[str] = None) -> Dict:
+    """RAM copy of a new interview, in the same shape repository.get_interview rehydrates."""
+    return live_interviews.put(interview_id, {
+        "id": interview_id,
+        "source": source,
+        "profile_text": profile_text,
+        "profile_analysis": profile_analysis,
+        "created_at": datetime.now().isoformat(),
+        "evaluation_mode": evaluation_mode,
+        "candidate_name": candidate_name,
+        "profile_digest": None,
+        "profile_digest_hash": None
+    })
 
-    if row:
-        return row[0]
+# Shared deadline for the profile analysis + question generation fan-out
+INTERVIEW_SETUP_DEADLINE = float(os.getenv("INTERVIEW_SETUP_DEADLINE", "45"))
 
-    cursor.execute(
-        "INSERT INTO candidates (name, created_at) VALUES (?, ?)",
-        (name, datetime.now().isoformat())
-    )
-    conn.commit()
-    return cursor.lastrowid
+# Keep references to fire-and-forget tasks so they aren't garbage collected
+background_tasks = set()
 
+# Models + prompt versions feed the LLM cache key: bump the version whenever a
+# prompt changes so stale cached results are not served for the new prompt.
+ANALYSIS_MODEL = "google/gemini-2.0-flash-001"
+ANALYSIS_PROMPT_VERSION = "v1"
+JD_QUESTIONS_MODEL = "openai/gpt-4o-mini"
+JD_QUESTIONS_PROMPT_VERSION = "v1"
 
 def extract_skills(text: str) -> List[str]:
     """Extract skills from resume text."""
@@ -100,6 +117,11 @@ def extract_skills(text: str) -> List[str]:
     return list(dict.fromkeys(skills))[:8]  # Remove duplicates and limit to 8 skills
 
 def analyze_resume_or_jd(text: str):
+    cache_key = make_key("profile_analysis", text, ANALYSIS_MODEL, ANALYSIS_PROMPT_VERSION)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     prompt = f"""
     Analyze the following resume or job description and return STRICT JSON only:
     {{
@@ -114,19 +136,16 @@ def analyze_resume_or_jd(text: str):
     """
 
     try:
-        response = get_client().chat.completions.create(
-            model="google/gemini-2.0-flash-001", # OpenRouter model ID
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        raw_text = response.choices[0].message.content
-        # Extract JSON
-        json_start = raw_text.find("{")
-        json_end = raw_text.rfind("}") + 1
-        return json.loads(raw_text[json_start:json_end])
+        raw_text = chat_completion(prompt, model=ANALYSIS_MODEL) # OpenRouter model ID
+        result = extract_json(raw_text)
+        llm_cache.set(cache_key, result)
+        return result
     except Exception as e:
         print(f"OpenRouter Analysis Error: {e}")
-        return {"skills": [], "projects": [], "tools_and_technologies": [], "experience_level": "Unknown", "domains": [], "important_keywords": []}
+        return empty_profile_analysis()
+
+def empty_profile_analysis() -> Dict:
+    return {"skills": [], "projects": [], "tools_and_technologies": [], "experience_level": "Unknown", "domains": [], "important_keywords": []}
     
 def extract_experiences(text: str) -> List[Dict]:
     """Extract work experiences from resume text."""
@@ -166,6 +185,48 @@ def extract_projects(text: str) -> List[Dict]:
     
     return projects
 
+# 🔹 Compact profile digest: sent to every evaluation/follow-up prompt instead of
+# the raw (up to 5000 chars) resume/JD text.
+DIGEST_MAX_ITEMS = 8
+DIGEST_MAX_ITEM_CHARS = 60
+
+def _digest_items(values, limit: int = DIGEST_MAX_ITEMS) -> str:
+    items = []
+    for value in values or []:
+        if isinstance(value, dict):
+            value = value.get("name") or value.get("title") or ""
+        value = " ".join(str(value).split())[:DIGEST_MAX_ITEM_CHARS]
+        if value and value.lower() not in (i.lower() for i in items):
+            items.append(value)
+        if len(items) >= limit:
+            break
+    return ", ".join(items)
+
+def build_profile_digest(profile_text: str, profile_analysis: Optional[Dict], source: str = "resume") -> str:
+    """Structured summary of a resume/JD: skills, projects, seniority and key terms."""
+    analysis = profile_analysis or {}
+    skills = analysis.get("skills") or extract_skills(profile_text or "")
+    projects = analysis.get("projects") or extract_projects(profile_text or "")
+    experience = analysis.get("experience_level")
+    if not experience or experience == "Unknown":
+        roles = _digest_items(extract_experiences(profile_text or ""), limit=3)
+        experience = f"Unknown (roles: {roles})" if roles else "Unknown"
+
+    lines = [
+        f"Source: {source}",
+        f"Seniority: {experience}",
+        f"Skills: {_digest_items(skills)}",
+        f"Tools & technologies: {_digest_items(analysis.get('tools_and_technologies'))}",
+        f"Projects: {_digest_items(projects, limit=4)}",
+        f"Domains: {_digest_items(analysis.get('domains'), limit=4)}",
+        f"Key terms: {_digest_items(analysis.get('important_keywords'))}",
+    ]
+    return "\n".join(line for line in lines if not line.endswith(": "))
+
+def profile_digest_hash(profile_text: str, profile_analysis: Optional[Dict]) -> str:
+    payload = json.dumps([profile_text or "", profile_analysis or {}], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 def generate_resume_questions(resume_text: str) -> List[Dict[str, str]]:
     """Generate personalized interview questions based on resume content."""
     print("Generating personalized resume-specific questions...")
@@ -346,19 +407,20 @@ def extract_text_from_file(file_content: bytes, filename: str) -> str:
         except:
             raise HTTPException(status_code=400, detail=f"Unable to process file {filename}. Supported formats: PDF, DOCX, TXT")
 
+def jd_intro_question() -> Dict:
+    return {
+        "id": 1,
+        "question": "Can you please introduce yourself and tell us why you are interested in this specific role?",
+        "difficulty": "Easy",
+        "type": "Self-Introduction",
+        "category": "Basic"
+    }
+
 def generate_jd_questions(jd_text: str) -> List[Dict[str, str]]:
     """Generate interview questions based on Job Description using AI."""
     print("Generating questions from Job Description...")
     
-    questions = [
-        {
-            "id": 1,
-            "question": "Can you please introduce yourself and tell us why you are interested in this specific role?",
-            "difficulty": "Easy",
-            "type": "Self-Introduction",
-            "category": "Basic"
-        }
-    ]
+    questions = [jd_intro_question()]
 
     prompt = f"""
     You are an expert technical recruiter constructing a rigorous interview.
@@ -388,14 +450,12 @@ def generate_jd_questions(jd_text: str) -> List[Dict[str, str]]:
     """
 
     try:
-        response = get_client().chat.completions.create(
-            model="openai/gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        raw = response.choices[0].message.content
-        start = raw.find("{")
-        end = raw.rfind("}") + 1
-        data = json.loads(raw[start:end])
+        cache_key = make_key("jd_questions", jd_text[:4000], JD_QUESTIONS_MODEL, JD_QUESTIONS_PROMPT_VERSION)
+        data = llm_cache.get(cache_key)
+        if data is None:
+            raw = chat_completion(prompt, model=JD_QUESTIONS_MODEL)
+            data = extract_json(raw)
+            llm_cache.set(cache_key, data)
         
         # Log extracted keywords for debugging/logging
         print(f"✅ Extracted JD Keywords: {data.get('extracted_keywords', [])}")
@@ -413,49 +473,54 @@ def generate_jd_questions(jd_text: str) -> List[Dict[str, str]]:
             
     except Exception as e:
         print(f"Error generating JD questions: {e}")
-        
-        # --- OFFLINE/FALLBACK MODE ---
-        # If API fails, try to extract keywords manually using Regex/List
-        common_keywords = [
-            "Python", "Java", "React", "Angular", "Vue", "AWS", "Azure", "Docker", "Kubernetes", "SQL", 
-            "NoSQL", "Git", "CI/CD", "Machine Learning", "AI", "Data Science", "Spring", "Node.js", 
-            "JavaScript", "TypeScript", "C++", "C#", ".NET", "Go", "Rust", "Swift", "Kotlin", "Flutter"
-        ]
-        
-        found_keywords = []
-        for kw in common_keywords:
-            if kw.lower() in jd_text.lower():
-                found_keywords.append(kw)
-        
-        print(f"⚠️ Offline Mode: Found keywords {found_keywords}")
-        
-        if found_keywords:
-            for i, kw in enumerate(found_keywords[:5]): # Top 5 matched
-                questions.append({
-                    "id": len(questions) + 1,
-                    "question": f"The job description mentions {kw}. Can you describe your experience with {kw} and a challenging problem you solved using it?",
-                    "difficulty": "Medium",
-                    "type": "Technical",
-                    "category": f"{kw} Skill"
-                })
-        else:
-             # Genuine Fallback if absolutely no keywords matched
-             questions.extend([
-                {
-                    "id": 2,
-                    "question": "What specifically attracted you to the technical requirements of this position?",
-                    "difficulty": "Medium",
-                    "type": "General",
-                    "category": "Fit"
-                },
-                {
-                    "id": 3,
-                    "question": "Can you walk us through your most significant technical achievement relevant to this role?",
-                    "difficulty": "Hard",
-                    "type": "Project",
-                    "category": "Experience"
-                }
-            ])
+        add_offline_jd_questions(jd_text, questions)
+
+    return questions
+
+def add_offline_jd_questions(jd_text: str, questions: List[Dict]) -> List[Dict]:
+    """Append keyword-based JD questions without calling the LLM."""
+    # --- OFFLINE/FALLBACK MODE ---
+    # If API fails, try to extract keywords manually using Regex/List
+    common_keywords = [
+        "Python", "Java", "React", "Angular", "Vue", "AWS", "Azure", "Docker", "Kubernetes", "SQL", 
+        "NoSQL", "Git", "CI/CD", "Machine Learning", "AI", "Data Science", "Spring", "Node.js", 
+        "JavaScript", "TypeScript", "C++", "C#", ".NET", "Go", "Rust", "Swift", "Kotlin", "Flutter"
+    ]
+    
+    found_keywords = []
+    for kw in common_keywords:
+        if kw.lower() in jd_text.lower():
+            found_keywords.append(kw)
+    
+    print(f"⚠️ Offline Mode: Found keywords {found_keywords}")
+    
+    if found_keywords:
+        for i, kw in enumerate(found_keywords[:5]): # Top 5 matched
+            questions.append({
+                "id": len(questions) + 1,
+                "question": f"The job description mentions {kw}. Can you describe your experience with {kw} and a challenging problem you solved using it?",
+                "difficulty": "Medium",
+                "type": "Technical",
+                "category": f"{kw} Skill"
+            })
+    else:
+         # Genuine Fallback if absolutely no keywords matched
+         questions.extend([
+            {
+                "id": 2,
+                "question": "What specifically attracted you to the technical requirements of this position?",
+                "difficulty": "Medium",
+                "type": "General",
+                "category": "Fit"
+            },
+            {
+                "id": 3,
+                "question": "Can you walk us through your most significant technical achievement relevant to this role?",
+                "difficulty": "Hard",
+                "type": "Project",
+                "category": "Experience"
+            }
+        ])
 
     return questions
 
@@ -466,6 +531,58 @@ def generate_mock_questions(text: str, source: str) -> List[Dict[str, str]]:
     else:  # job description
         return generate_jd_questions(text)
 
+def generate_offline_mock_questions(text: str, source: str) -> List[Dict[str, str]]:
+    """Question set that needs no LLM call (used when the setup deadline expires)."""
+    if "resume" in source.lower():
+        return generate_resume_questions(text)
+    return add_offline_jd_questions(text, [jd_intro_question()])
+
+async def prepare_interview(content: str, source: str, defer_analysis: bool = False):
+    """Run profile analysis and question generation concurrently under one deadline.
+
+    Returns (profile_analysis, questions, pending_analysis). When the analysis
+    is deferred or misses the deadline, profile_analysis is None and
+    pending_analysis is the still-running task; the caller attaches its result
+    to the interview once it has been stored.
+    """
+    analysis_task = asyncio.ensure_future(run_llm(analyze_resume_or_jd, content))
+    questions_task = asyncio.ensure_future(run_llm(generate_mock_questions, content, source))
+
+    waiting_on = {questions_task} if defer_analysis else {analysis_task, questions_task}
+    await asyncio.wait(waiting_on, timeout=INTERVIEW_SETUP_DEADLINE)
+
+    if questions_task.done():
+        questions = questions_task.result()
+    else:
+        print(f"⚠️ Question generation missed the {INTERVIEW_SETUP_DEADLINE}s deadline, using offline questions")
+        questions_task.cancel()
+        questions = generate_offline_mock_questions(content, source)
+
+    if analysis_task.done():
+        return analysis_task.result(), questions, None
+    return None, questions, analysis_task
+
+async def attach_profile_analysis(interview_id: str, analysis_task):
+    """Store a late profile analysis on the interview (RAM + DB) once it finishes."""
+    try:
+        profile_analysis = await analysis_task
+    except Exception as e:
+        print(f"⚠️ Background profile analysis failed for {interview_id}: {e}")
+        profile_analysis = empty_profile_analysis()
+
+    live_interviews.update(interview_id, profile_analysis=profile_analysis)
+
+    try:
+        await repository.save_profile_analysis(interview_id, profile_analysis)
+    except Exception as db_e:
+        print(f"⚠️ DB Save Error: {db_e}")
+    print(f"✅ Profile analysis attached to {interview_id}")
+
+def schedule_profile_analysis(interview_id: str, analysis_task):
+    task = asyncio.create_task(attach_profile_analysis(interview_id, analysis_task))
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
 def score_answer(question: str, answer: str):
     prompt = f"""
 You are an interview evaluator.
@@ -490,15 +607,8 @@ Return STRICT JSON only:
 }}
 """
 
-    response = get_client().chat.completions.create(
-        model="openai/gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}]
-    )
-
-    raw = response.choices[0].message.content
-    start = raw.find("{")
-    end = raw.rfind("}") + 1
-    return json.loads(raw[start:end])
+    raw = chat_completion(prompt, model="openai/gpt-4o-mini")
+    return extract_json(raw)
 
 # --- ADAPTIVE INTERVIEW LOGIC ---
 
@@ -512,7 +622,8 @@ def generate_followup_question(answer_text: str, resume_context: str, current_q_
     You are an intelligent technical interviewer.
     
     Context:
-    - Candidate Resume Summary: {resume_context[:1000]}...
+    - Candidate Profile Summary:
+{resume_context[:1000]}
     - Candidate's Last Answer: "{answer_text}"
     
     Task:
@@ -531,14 +642,8 @@ def generate_followup_question(answer_text: str, resume_context: str, current_q_
     """
     
     try:
-        response = get_client().chat.completions.create(
-            model="openai/gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        raw = response.choices[0].message.content
-        start = raw.find("{")
-        end = raw.rfind("}") + 1
-        q_data = json.loads(raw[start:end])
+        raw = chat_completion(prompt, model="openai/gpt-4o-mini")
+        q_data = extract_json(raw)
         
         # Add ID
         q_data["id"] = current_q_id + 1
@@ -554,44 +659,124 @@ def generate_followup_question(answer_text: str, resume_context: str, current_q_
             "category": "Follow-up"
         }
 
+# --- SPECULATIVE FOLLOW-UPS ---
+# While the candidate is still answering, the client sends the draft transcript
+# and we start generating the follow-up early. When the final answer arrives we
+# reuse that result if the answer hasn't meaningfully changed.
+SPECULATION_MIN_CHARS = int(os.getenv("SPECULATION_MIN_CHARS", "40"))
+SPECULATION_SIMILARITY = float(os.getenv("SPECULATION_SIMILARITY", "0.85"))
+SPECULATION_MAX_ENTRIES = 1000
+
+speculations = OrderedDict()  # (interview_id, question_id) -> speculation
+speculation_lock = threading.Lock()
+speculation_stats = {
+    "drafts_received": 0,
+    "started": 0,
+    "hits": 0,
+    "misses": 0,
+    "no_speculation": 0,
+    "latency_saved_ms": 0.0
+}
+
+class SpeculateRequest(BaseModel):
+    interview_id: str
+    current_question_id: int
+    draft_text: str
+
+def answer_similarity(a: str, b: str) -> float:
+    return SequenceMatcher(None, a.lower().split(), b.lower().split()).ratio()
+
+def _mark_speculation_finished(spec):
+    spec["finished_at"] = time.perf_counter()
+
+def take_speculative_followup(interview_id: str, question_id: int, answer_text: str) -> Optional[Dict]:
+    """Return the speculative follow-up if it was generated from a close-enough draft."""
+    with speculation_lock:
+        spec = speculations.pop((interview_id, question_id), None)
+    if spec is None:
+        speculation_stats["no_speculation"] += 1
+        return None
+
+    if answer_similarity(spec["draft"], answer_text) < SPECULATION_SIMILARITY:
+        spec["future"].cancel()
+        speculation_stats["misses"] += 1
+        return None
+
+    arrived_at = time.perf_counter()
+    try:
+        question = spec["future"].result()
+    except Exception as e:
+        print(f"⚠️ Speculative follow-up failed: {e}")
+        speculation_stats["misses"] += 1
+        return None
+    waited = time.perf_counter() - arrived_at
+    generation_time = spec.get("finished_at", time.perf_counter()) - spec["started_at"]
+
+    speculation_stats["hits"] += 1
+    speculation_stats["latency_saved_ms"] += max(generation_time - waited, 0) * 1000
+    return dict(question)
+
+@app.post("/speculate-next-question")
+def speculate_next_question(req: SpeculateRequest):
+    speculation_stats["drafts_received"] += 1
+    draft = req.draft_text.strip()
+    if len(draft) < SPECULATION_MIN_CHARS:
+        return {"status": "skipped"}
+    if not live_interviews.load_blocking(req.interview_id):
+        raise HTTPException(status_code=404, detail="Interview not found")
+
+    key = (req.interview_id, req.current_question_id)
+    with speculation_lock:
+        spec = speculations.get(key)
+        if spec and answer_similarity(spec["draft"], draft) >= SPECULATION_SIMILARITY:
+            # The running speculation still matches the draft
+            return {"status": "ready" if spec["future"].done() else "running"}
+        if spec:
+            spec["future"].cancel()
+
+        spec = {"draft": draft, "started_at": time.perf_counter()}
+        spec["future"] = submit_llm(
+            generate_followup_question,
+            draft,
+            get_profile_digest(req.interview_id) or "",
+            req.current_question_id
+        )
+        spec["future"].add_done_callback(lambda _f, spec=spec: _mark_speculation_finished(spec))
+        speculations[key] = spec
+        while len(speculations) > SPECULATION_MAX_ENTRIES:
+            _, stale = speculations.popitem(last=False)
+            stale["future"].cancel()
+
+    speculation_stats["started"] += 1
+    return {"status": "started"}
+
+def speculation_metrics() -> Dict:
+    decided = speculation_stats["hits"] + speculation_stats["misses"]
+    return {
+        **speculation_stats,
+        "latency_saved_ms": round(speculation_stats["latency_saved_ms"], 1),
+        "hit_rate": round(speculation_stats["hits"] / decided, 3) if decided else 0.0,
+        "in_flight": len(speculations)
+    }
+
 @app.post("/generate-next-question")
 def api_gen_next_question(req: NextQuestionRequest):
-    if req.interview_id not in interviews:
+    if not live_interviews.load_blocking(req.interview_id):
         raise HTTPException(status_code=404, detail="Interview not found")
         
-    interview = interviews[req.interview_id]
-    
-    # Generate the question
-    new_question = generate_followup_question(
-        req.answer_text, 
-        interview.get("profile_text", ""),
-        req.current_question_id
-    )
+    # Generate the question (reusing the speculative one when the answer still matches)
+    new_question = take_speculative_followup(req.interview_id, req.current_question_id, req.answer_text)
+    if new_question is None:
+        new_question = generate_followup_question(
+            req.answer_text, 
+            get_profile_digest(req.interview_id) or "",
+            req.current_question_id
+        )
     
-    # Insert this new question into the list right after current
-    # Find current index
-    current_idx = -1
-    for i, q in enumerate(interview["questions"]):
-        if int(q["id"]) == req.current_question_id:
-            current_idx = i
-            break
-            
-    if current_idx != -1:
-        # Check if we already have a follow-up (avoid infinite expansion if re-running)
-        if current_idx + 1 < len(interview["questions"]):
-             # If next question is already a "Follow-up", maybe replace it? 
-             # For now, let's just INSERT it to be dynamic.
-             # Shift IDs of subsequent questions
-             for q in interview["questions"][current_idx+1:]:
-                 q["id"] = int(q["id"]) + 1
-                 
-        interview["questions"].insert(current_idx + 1, new_question)
-        
-        # Update DB with new question list
-        cursor.execute("UPDATE interviews SET questions = ? WHERE id = ?", (json.dumps(interview["questions"]), req.interview_id))
-        conn.commit()
-        
-        return new_question
+    # Slot it in right after the current question; later questions move down one ordinal
+    inserted = repository.insert_question_after.blocking(req.interview_id, req.current_question_id, new_question)
+    if inserted:
+        return inserted
     
     raise HTTPException(status_code=400, detail="Current question ID not found")
 
@@ -600,7 +785,8 @@ def api_gen_next_question(req: NextQuestionRequest):
 @app.post("/upload-resume/")
 async def upload_resume(
     file: UploadFile = File(...),
-    source: str = Form("resume")
+    source: str = Form("resume"),
+    defer_analysis: bool = Form(False)
 ):
     try:
         print(f"Uploading resume with source: {source}")
@@ -617,47 +803,29 @@ async def upload_resume(
         # Generate interview ID
         interview_id = f"int_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
 
-        # Analyze the resume
-        profile_analysis = analyze_resume_or_jd(content_str)
-
-        # Generate questions
-        questions = generate_mock_questions(content_str, source)
+        # Analyze the resume and generate questions (concurrently)
+        profile_analysis, questions, pending_analysis = await prepare_interview(content_str, source, defer_analysis)
 
         if not questions:
             raise HTTPException(status_code=400, detail="Failed to generate questions")
 
         # Store interview data (RAM)
-        interviews[interview_id] = {
-            "id": interview_id,
-            "source": source,
-            "profile_text": content_str[:5000], # Store more text
-            "profile_analysis": profile_analysis,
-            "questions": questions,
-            "answers": {},
-            "created_at": datetime.now().isoformat()
-        }
+        new_session(interview_id, source, content_str[:5000], profile_analysis)
 
         # Store interview data (DB)
         try:
-            cursor.execute("""
-                INSERT INTO interviews (id, source, profile_text, questions, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                interview_id, 
-                source, 
-                content_str[:5000], 
-                json.dumps(questions), 
-                datetime.now().isoformat()
-            ))
-            conn.commit()
+            await repository.create_interview(interview_id, source, content_str[:5000], profile_analysis, questions)
         except Exception as db_e:
             print(f"⚠️ DB Save Error: {db_e}")
 
+        if pending_analysis:
+            schedule_profile_analysis(interview_id, pending_analysis)
 
         return {
             "interview_id": interview_id,
             "total_questions": len(questions),
-            "first_question": questions[0]
+            "first_question": questions[0],
+            "profile_analysis_ready": pending_analysis is None
         }
 
     except HTTPException:
@@ -670,53 +838,37 @@ async def upload_resume(
 @app.post("/start-interview/")
 async def start_interview(
     content: str = Form(...),
-    source: str = Form("resume")
+    source: str = Form("resume"),
+    defer_analysis: bool = Form(False)
 ):
     try:
         print(f"Starting interview with source: {source}")
 
         interview_id = f"int_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
 
-        # ✅ STEP-3.2 → AI ANALYSIS (CORRECT PLACE)
-        profile_analysis = analyze_resume_or_jd(content)
-
-        # Generate questions based on Source (Resume vs JD)
-        questions = generate_mock_questions(content, source)
+        # ✅ STEP-3.2 → AI ANALYSIS + questions based on Source (Resume vs JD), run concurrently
+        profile_analysis, questions, pending_analysis = await prepare_interview(content, source, defer_analysis)
 
         if not questions:
             raise HTTPException(status_code=400, detail="Failed to generate questions")
 
         # ✅ STEP-3.3 → STORE ANALYSIS HERE (RAM)
-        interviews[interview_id] = {
-            "id": interview_id,
-            "source": source,
-            "profile_text": content[:5000],
-            "profile_analysis": profile_analysis,
-            "questions": questions,
-            "answers": {},
-            "created_at": datetime.now().isoformat()
-        }
+        new_session(interview_id, source, content[:5000], profile_analysis)
 
         # Store interview data (DB)
         try:
-            cursor.execute("""
-                INSERT INTO interviews (id, source, profile_text, questions, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                interview_id, 
-                source, 
-                content[:5000], 
-                json.dumps(questions), 
-                datetime.now().isoformat()
-            ))
-            conn.commit()
+            await repository.create_interview(interview_id, source, content[:5000], profile_analysis, questions)
         except Exception as db_e:
             print(f"⚠️ DB Save Error: {db_e}")
 
+        if pending_analysis:
+            schedule_profile_analysis(interview_id, pending_analysis)
+
         return {
             "interview_id": interview_id,
             "total_questions": len(questions),
-            "first_question": questions[0]
+            "first_question": questions[0],
+            "profile_analysis_ready": pending_analysis is None
         }
 
     except Exception as e:
@@ -724,121 +876,159 @@ async def start_interview(
 
 @app.get("/interview/{interview_id}/question/{question_id}")
 async def get_question(interview_id: str, question_id: int):
-    # Restore from DB if not in RAM
-    if interview_id not in interviews:
-        cursor.execute("SELECT source, profile_text, questions, created_at FROM interviews WHERE id = ?", (interview_id,))
-        row = cursor.fetchone()
-        if row:
-            print(f"🔄 Restoring interview {interview_id} from DB...")
-            try:
-                loaded_questions = json.loads(row[2])
-                interviews[interview_id] = {
-                    "id": interview_id,
-                    "source": row[0],
-                    "profile_text": row[1],
-                    "questions": loaded_questions,
-                    "answers": {},
-                    "created_at": row[3]
-                }
-            except Exception as e:
-                print(f"Restore failed: {e}")
-    
-    if interview_id not in interviews:
+    # Restored from DB if not in RAM
+    if not await live_interviews.load(interview_id):
         raise HTTPException(status_code=404, detail="Interview not found")
     
-    interview = interviews[interview_id]
-    # Ensure ID comparison works (cast both to int)
-    question = next((q for q in interview["questions"] if int(q["id"]) == int(question_id)), None)
+    question, total_questions = await repository.get_question(interview_id, question_id)
     
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
         
     return {
         "current_question": question,  # This key must match what your HTML looks for
-        "total_questions": len(interview["questions"]),
+        "total_questions": total_questions,
         "interview_id": interview_id
     }
-# Add this import at the top
-
-import base64
-
 @app.post("/upload-answer")
 async def upload_answer(
     interview_id: str = Form(...),
     question_id: int = Form(...),
-    video: UploadFile = File(...)
+    video: UploadFile = File(...),
+    candidate_name: str = Form("Candidate"),
+    score: bool = Form(True),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
-    if interview_id not in interviews:
+    """Recorded answer -> audio (ffmpeg pipe) -> transcript (cached by content) -> stored answer -> optional scoring."""
+    if not await live_interviews.load(interview_id):
         raise HTTPException(status_code=404, detail="Interview not found")
 
-    with tempfile.TemporaryDirectory() as tmp:
-        video_path = os.path.join(tmp, "input.webm")
-        audio_path = os.path.join(tmp, "audio.wav")
-
-        with open(video_path, "wb") as f:
-            f.write(await video.read())
+    question, _ = await repository.get_question(interview_id, question_id)
+    if not question:
+        raise HTTPException(status_code=404, detail="Question not found")
 
-        # Extract audio using ffmpeg
-        subprocess.run([
-            "ffmpeg", "-i", video_path,
-            "-ar", "16000",
-            "-ac", "1",
-            audio_path
-        ], check=True)
+    existing = await find_answer(interview_id, question_id, idempotency_key)
+    if idempotency_key and existing and existing["idempotency_key"] == idempotency_key:
+        return save_answer_response(existing)
+
+    timings = {}
+    started = time.perf_counter()
+
+    # 1-2. Extract 16 kHz mono audio straight from the upload (async ffmpeg, concurrency-limited)
+    # and transcribe it on the workers, unless this exact recording was transcribed before
+    index = await get_correction_index(interview_id, candidate_name)
+    result, cached = await transcribe_upload(video, interview_prompt(candidate_name, index.prompt_terms()), timings)
+    transcript = index.correct(result["text"].strip())
+
+    # A retried upload of the same recording (no or a new Idempotency-Key) gets the
+    # stored answer back instead of resetting its score and scoring it again
+    answer_hash = compute_answer_hash(transcript)
+    if is_replay(existing, answer_hash, idempotency_key):
+        print(f"↩️ Answer {existing['id']} already saved, returning stored result.")
+        timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return {**save_answer_response(existing), "transcript": transcript, "transcript_cached": cached, "timings_ms": timings}
+
+    # 3. Store against (interview_id, question_id), replacing an earlier attempt
+    stage = time.perf_counter()
+    queue_scoring = score and bool(transcript) and await get_evaluation_mode(interview_id) != "batch"
+    scoring_status = "pending" if queue_scoring else "deferred"
+    answer_id = await upsert_answer(
+        interview_id, question_id, question["question"], transcript, answer_hash, idempotency_key, scoring_status
+    )
+    timings["store_ms"] = round((time.perf_counter() - stage) * 1000, 1)
 
-        # Whisper STT
+    # 4. Scoring runs on the scoring queue; the client follows score_url / events_url
+    response = {
+        "status": "saved",
+        "answer_id": answer_id,
+        "transcript": transcript,
+        "audio_seconds": round(result.get("duration") or 0, 2),
+        "speech_seconds": result.get("speech_seconds"),
+        "transcript_cached": cached,
+        "scoring_status": scoring_status
+    }
+    if queue_scoring:
+        stage = time.perf_counter()
+        queue_answer_scoring(answer_id, interview_id, question_id, question["question"], transcript, await interview_context(interview_id))
+        timings["queue_scoring_ms"] = round((time.perf_counter() - stage) * 1000, 1)
+        response["score_url"] = f"/answers/{answer_id}/score"
+        response["events_url"] = f"/answers/{answer_id}/score/events"
+
+    timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    response["timings_ms"] = timings
+    print(f"🎬 Answer {answer_id} processed: {timings}")
+    return response
 
 @app.get("/interview/{interview_id}/summary")
 async def get_interview_summary(interview_id: str):
     """Get a summary of the interview including all questions and answers."""
-    if interview_id not in interviews:
+    interview = await live_interviews.load(interview_id)
+    if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     
-    interview = interviews[interview_id]
+    questions, answers = await asyncio.gather(
+        repository.list_questions(interview_id), repository.interview_answers(interview_id)
+    )
     return {
         "interview_id": interview_id,
         "source": interview["source"],
         "created_at": interview["created_at"],
-        "total_questions": len(interview["questions"]),
-        "questions_answered": len(interview["answers"]),
-        "questions": interview["questions"],
-        "answers": interview["answers"]
+        "total_questions": len(questions),
+        "questions_answered": len(answers),
+        "questions": questions,
+        "answers": answers
     }
 @app.get("/")
 def root():
     return {"status": "Backend is running"}
 
+@app.get("/health")
+def health():
+    llm = breaker.snapshot()
+    return {
+        "status": "ok" if llm["state"] == "closed" else "degraded",
+        "llm": llm
+    }
+
+@app.get("/metrics")
+def metrics():
+    return {
+        "llm_cache": llm_cache.stats(),
+        "speculation": speculation_metrics(),
+        "answer_evaluations": answer_flights.stats(),
+        "transcription": transcription_pool.stats(),
+        "transcript_cache": transcript_cache.stats(),
+        "sessions": live_interviews.stats(),
+        "queues": [precompute_queue.stats(), scoring_queue.stats()]
+    }
+
 class ChatRequest(BaseModel):
     message: str
 @app.post("/chat")
 def chat(req: ChatRequest):
-    url = "https://openrouter.ai/api/v1/chat/completions"
-
     headers = {
-        "Authorization": f"Bearer {os.getenv('OPENROUTER_API_KEY')}",
-        "Content-Type": "application/json",
         "HTTP-Referer": "http://localhost",
         "X-Title": "Voice Chatbot"
     }
 
-    data = {
-        "model": "openai/gpt-4o-mini",
-        "messages": [
-            {
-                "role": "system",
-                "content": "You are a helpful interview assistant. Keep responses short."
-            },
-            {
-                "role": "user",
-                "content": req.message
-            }
-        ]
-    }
+    messages = [
+        {
+            "role": "system",
+            "content": "You are a helpful interview assistant. Keep responses short."
+        },
+        {
+            "role": "user",
+            "content": req.message
+        }
+    ]
 
-    response = requests.post(url, headers=headers, json=data)
+    try:
+        reply = chat_completion(messages, model="openai/gpt-4o-mini", extra_headers=headers)
+    except LLMUnavailable:
+        raise HTTPException(status_code=503, detail="AI assistant is temporarily unavailable")
 
     return {
-        "reply": response.json()["choices"][0]["message"]["content"]
+        "reply": reply
     }
 
 class AnswerRequest(BaseModel):
@@ -850,85 +1040,228 @@ class AnswerRequest(BaseModel):
     
 
 
+# Background answer scoring (so /save-answer returns after a DB insert)
+SCORING_CONCURRENCY = int(os.getenv("SCORING_CONCURRENCY", "4"))
+SCORING_EVENTS_TIMEOUT = float(os.getenv("SCORING_EVENTS_TIMEOUT", "60"))
+scoring_queue = JobQueue("answer-scoring", concurrency=SCORING_CONCURRENCY)
+
+# "per_answer": score each answer as it is saved; "batch": score the whole interview at the end
+EVALUATION_MODES = ("per_answer", "batch")
+
+async def get_evaluation_mode(interview_id: str) -> str:
+    interview = await live_interviews.load(interview_id)
+    return (interview or {}).get("evaluation_mode") or "per_answer"
+
+def get_profile_digest(interview_id: str) -> Optional[str]:
+    """The interview's profile digest, rebuilt only when the profile has changed.
+
+    Blocking (DB read/write); async code goes through interview_context().
+    """
+    interview = live_interviews.load_blocking(interview_id)
+    if not interview:
+        return None
+    profile_text = interview.get("profile_text") or ""
+    profile_analysis = interview.get("profile_analysis")
+    source = interview.get("source") or "Resume"
+    digest, digest_hash = interview.get("profile_digest"), interview.get("profile_digest_hash")
+
+    current_hash = profile_digest_hash(profile_text, profile_analysis)
+    if digest and digest_hash == current_hash:
+        return digest
+
+    digest = build_profile_digest(profile_text, profile_analysis, source)
+    live_interviews.update(interview_id, profile_digest=digest, profile_digest_hash=current_hash)
+    try:
+        repository.save_profile_digest.blocking(interview_id, digest, current_hash)
+    except Exception as db_e:
+        print(f"⚠️ DB Save Error: {db_e}")
+    return digest
+
+def get_interview_context(interview_id: str) -> str:
+    """Resume/JD context for answer evaluation prompts (the compact profile digest)."""
+    digest = get_profile_digest(interview_id)
+    return f"Candidate profile digest:\n{digest}" if digest else ""
+
+async def interview_context(interview_id: str) -> str:
+    return await run_db(get_interview_context, interview_id)
+
+# 🔹 One answer row per (interview_id, question_id). Retries and the UI calling both
+# /analyze-answer and /save-answer reuse the stored result (same answer text or
+# same Idempotency-Key) or join the in-flight evaluation instead of re-scoring.
+answer_flights = SingleFlight()
+
+def compute_answer_hash(answer_text: str) -> str:
+    return hashlib.sha256(" ".join((answer_text or "").split()).encode("utf-8")).hexdigest()
+
+def parse_keywords(stored: Optional[str]) -> List[str]:
+    # Older rows hold a JSON list, newer ones a comma-separated string
+    if not stored:
+        return []
+    try:
+        value = json.loads(stored)
+        if isinstance(value, list):
+            return value
+    except ValueError:
+        pass
+    return [k for k in stored.split(",") if k]
+
+def is_replay(existing: Optional[Dict], answer_hash: str, idempotency_key: Optional[str]) -> bool:
+    """True when the stored answer row already covers this request."""
+    if not existing:
+        return False
+    if idempotency_key and existing["idempotency_key"] == idempotency_key:
+        return True
+    return existing["answer_hash"] == answer_hash and existing["scoring_status"] != "failed"
+
+def stored_result(existing: Dict) -> Dict:
+    return {
+        "corrected_answer": existing["corrected_answer"] or "",
+        "overall_score": existing["ai_score"] or 0,
+        "feedback": existing["ai_feedback"] or "",
+        "keywords": parse_keywords(existing["ai_keywords"])
+    }
+
+def evaluate_answer_once(interview_id, question_id, question_text: str, answer_text: str, answer_hash: str, context: str):
+    """Future for analyze_answer, shared by every concurrent request for the same answer."""
+    key = (interview_id, question_id, answer_hash)
+    return answer_flights.submit(key, analyze_answer, question_text, answer_text, context)
+
+async def score_saved_answer(answer_id: int, interview_id: str, question_id: int, question_text: str, answer_text: str, context: str):
+    """Scoring job: evaluate a stored answer and write the result back to its row."""
+    answer_hash = compute_answer_hash(answer_text)
+    try:
+        ai_result = await asyncio.wrap_future(
+            evaluate_answer_once(interview_id, question_id, question_text, answer_text, answer_hash, context)
+        )
+    except Exception:
+        await repository.mark_answer_failed(answer_id, answer_hash)
+        raise
+
+    await repository.save_answer_score(answer_id, answer_hash, ai_result)
+    print(f"✅ Answer {answer_id} scored.")
+    return {"ai_score": ai_result.get("overall_score", 0)}
+
+def queue_answer_scoring(answer_id: int, interview_id: str, question_id: int, question_text: str, answer_text: str, context: str):
+    scoring_queue.submit(
+        score_saved_answer, answer_id, interview_id, question_id, question_text, answer_text, context,
+        job_id=str(answer_id)
+    )
+
+def save_answer_response(existing: Dict) -> Dict:
+    answer_id = existing["id"]
+    status = existing["scoring_status"] or "done"
+    response = {"status": "saved", "answer_id": answer_id, "scoring_status": status}
+    if status == "pending":
+        response["score_url"] = f"/answers/{answer_id}/score"
+        response["events_url"] = f"/answers/{answer_id}/score/events"
+    elif status == "done":
+        response["ai_score"] = existing["ai_score"] or 0
+        response["ai_feedback"] = existing["ai_feedback"] or ""
+    return response
+
 @app.post("/save-answer")
 async def save_answer(
     interview_id: str = Form(...),
     question_id: int = Form(...),
     question_text: str = Form(...),
     answer_text: str = Form(...),
-    candidate_name: str = Form("Candidate")
+    candidate_name: str = Form("Candidate"),
+    async_scoring: bool = Form(False),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
     print(f"💾 Saving answer for {question_id}...")
+
+    answer_hash = compute_answer_hash(answer_text)
+    existing = await find_answer(interview_id, question_id, idempotency_key)
+    if is_replay(existing, answer_hash, idempotency_key):
+        print(f"↩️ Answer {existing['id']} already saved, returning stored result.")
+        return save_answer_response(existing)
     
+    if await get_evaluation_mode(interview_id) == "batch":
+        # Scored together with the rest of the interview by /interview/{id}/evaluate
+        answer_id = await upsert_answer(interview_id, question_id, question_text, answer_text, answer_hash, idempotency_key, "deferred")
+        print("✅ Answer saved to DB (batch evaluation at the end).")
+        return {"status": "saved", "answer_id": answer_id, "scoring_status": "deferred"}
+
     # Get context
-    context = ""
-    # Try RAM first
-    if interview_id in interviews:
-         profile_text = interviews[interview_id].get("profile_text", "")
-         source = interviews[interview_id].get("source", "Resume")
-         context = f"Candidate's {source}: {profile_text}"
-    else:
-        # Try DB
-        try:
-            cursor.execute("SELECT profile_text, source FROM interviews WHERE id = ?", (interview_id,))
-            row = cursor.fetchone()
-            if row:
-                context = f"Candidate's {row[1]}: {row[0]}"
-                # Optional: Restore to RAM for next time
-                # interviews[interview_id] = { "profile_text": row[0], "source": row[1] } 
-        except Exception as e:
-            print(f"⚠️ Context fetch error: {e}")
+    context = await interview_context(interview_id)
 
-    # Use the robust analyze_answer function
-    ai_result = analyze_answer(question_text, answer_text, context)
+    if async_scoring:
+        # Save now, score on the worker queue; results land on the same row
+        answer_id = await upsert_answer(interview_id, question_id, question_text, answer_text, answer_hash, idempotency_key, "pending")
+        queue_answer_scoring(answer_id, interview_id, question_id, question_text, answer_text, context)
+        print(f"✅ Answer saved to DB (id {answer_id}), scoring queued.")
 
-    # Prepare keywords (handle list or string)
-    keywords = ai_result.get("keywords", [])
-    if isinstance(keywords, list):
-        keywords_str = ",".join(keywords)
-    else:
-        keywords_str = str(keywords)
-
-    cursor.execute("""
-        INSERT INTO answers (
-            interview_id,
-            question_id,
-            question_text,
-            answer_text,
-            ai_score,
-            ai_feedback,
-            ai_keywords,
-            created_at
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        interview_id,
-        question_id,
-        question_text,
-        answer_text,
-        ai_result.get("overall_score", 0),
-        ai_result.get("feedback", "No feedback"),
-        keywords_str,
-        datetime.now().isoformat()
-    ))
-
-    conn.commit()
+        return {
+            "status": "saved",
+            "answer_id": answer_id,
+            "scoring_status": "pending",
+            "score_url": f"/answers/{answer_id}/score",
+            "events_url": f"/answers/{answer_id}/score/events"
+        }
+
+    # Use the robust analyze_answer function
+    ai_result = await asyncio.wrap_future(
+        evaluate_answer_once(interview_id, question_id, question_text, answer_text, answer_hash, context)
+    )
+    answer_id = await upsert_answer(interview_id, question_id, question_text, answer_text, answer_hash, idempotency_key, "done", ai_result)
     print("✅ Answer saved to DB.")
 
     return {
         "status": "saved",
+        "answer_id": answer_id,
+        "scoring_status": "done",
         "ai_score": ai_result.get("overall_score", 0),
         "ai_feedback": ai_result.get("feedback", "")
     }
 
+@app.get("/answers/{answer_id}/score")
+async def get_answer_score(answer_id: int):
+    score = await read_answer_score(answer_id)
+    if not score:
+        raise HTTPException(status_code=404, detail="Answer not found")
+    return score
+
+@app.get("/answers/{answer_id}/score/events")
+async def answer_score_events(answer_id: int):
+    """Server-sent events: one 'score' event once the answer has been scored."""
+    if not await read_answer_score(answer_id):
+        raise HTTPException(status_code=404, detail="Answer not found")
+
+    async def event_stream():
+        score = await read_answer_score(answer_id)
+        if score["scoring_status"] == "pending":
+            yield f"event: pending\ndata: {json.dumps(score)}\n\n"
+            await scoring_queue.wait(str(answer_id), timeout=SCORING_EVENTS_TIMEOUT)
+            score = await read_answer_score(answer_id)
+        event = "score" if score["scoring_status"] != "pending" else "timeout"
+        yield f"event: {event}\ndata: {json.dumps(score)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@app.post("/interview/{interview_id}/evaluate")
+async def evaluate_interview(interview_id: str, rescore: bool = False):
+    """Batch-evaluate an interview's answers in one (or a few chunked) LLM prompts."""
+    rows = await repository.answers_to_evaluate(interview_id, rescore)
+    if not rows:
+        return {"interview_id": interview_id, "evaluated": 0}
+
+    context = await interview_context(interview_id)
+    results = await run_llm(analyze_answers_batch, [(row[1], row[2]) for row in rows], context)
+
+    await repository.save_batch_scores([(row[0], result) for row, result in zip(rows, results)])
+
+    scores = [result.get("overall_score", 0) for result in results]
+    print(f"✅ Batch-evaluated {len(rows)} answers for {interview_id}")
+    return {
+        "interview_id": interview_id,
+        "evaluated": len(rows),
+        "average_score": round(sum(scores) / len(scores), 2)
+    }
+
 @app.get("/interview/{interview_id}/ai-summary")
 def interview_ai_summary(interview_id: str):
-    cursor.execute("""
-        SELECT ai_score FROM answers
-        WHERE interview_id = ? AND ai_score IS NOT NULL
-    """, (interview_id,))
-    
-    scores = [row[0] for row in cursor.fetchall()]
+    scores = repository.answer_scores.blocking(interview_id)
     avg_score = round(sum(scores) / len(scores), 2) if scores else 0
 
     return {
@@ -944,36 +1277,23 @@ class AnalyzeRequest(BaseModel):
     answer: str
 
 @app.post("/analyze-answer")
-def analyze(req: AnalyzeRequest):
+def analyze(req: AnalyzeRequest, idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")):
+    answer_hash = compute_answer_hash(req.answer)
+    existing = find_answer.blocking(req.interview_id, req.question_id, idempotency_key)
+    if is_replay(existing, answer_hash, idempotency_key) and existing["scoring_status"] in (None, "done"):
+        return stored_result(existing)
+
     context = ""
-    # Retrieve Resume/JD context from the CURRENT in-memory session (not historical DB data)
-    if req.interview_id and req.interview_id in interviews:
-         profile_text = interviews[req.interview_id].get("profile_text", "")
-         source = interviews[req.interview_id].get("source", "Resume")
-         context = f"Candidate's {source}: {profile_text}"
+    # Retrieve Resume/JD context (profile digest) for the interview being answered
+    if req.interview_id:
+        context = get_interview_context(req.interview_id)
     
-    result = analyze_answer(req.question, req.answer, context)
+    # Joins an in-flight evaluation of the same answer (e.g. a queued /save-answer job)
+    result = evaluate_answer_once(req.interview_id, req.question_id, req.question, req.answer, answer_hash, context).result()
 
     # Store in DB
     try:
-        cursor.execute("""
-            INSERT INTO answers (
-                interview_id, question_id, question_text, answer_text, 
-                ai_score, ai_feedback, ai_keywords, corrected_answer, created_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            req.interview_id,
-            req.question_id,
-            req.question,
-            req.answer,
-            result.get("overall_score", 0),
-            result.get("feedback", ""),
-            json.dumps(result.get("keywords", [])),
-            result.get("corrected_answer", ""),
-            datetime.now().isoformat()
-        ))
-        conn.commit()
+        upsert_answer.blocking(req.interview_id, req.question_id, req.question, req.answer, answer_hash, idempotency_key, "done", result)
     except Exception as e:
         print(f"⚠️ Failed to save answer to DB: {e}")
 
@@ -998,12 +1318,7 @@ async def upload_full_recording(
             shutil.copyfileobj(file.file, buffer)
             
         # Update database
-        cursor.execute("""
-            UPDATE interviews
-            SET recording_path = ?
-            WHERE id = ?
-        """, (file_path, interview_id))
-        conn.commit()
+        await repository.save_recording_path(interview_id, file_path)
         
         return {"status": "success", "file_path": file_path}
     except Exception as e:
@@ -1020,21 +1335,14 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 @app.get("/generate-report/{interview_id}")
 def generate_report(interview_id: str):
     # Fetch interview data
-    cursor.execute("SELECT source, created_at, profile_text FROM interviews WHERE id = ?", (interview_id,))
-    interview_data = cursor.fetchone()
+    interview_data = repository.get_interview.blocking(interview_id)
     if not interview_data:
         raise HTTPException(status_code=404, detail="Interview not found")
     
-    source, date, profile_text = interview_data
+    source, date = interview_data["source"], interview_data["created_at"]
     
     # Fetch Q&A data
-    cursor.execute("""
-        SELECT question_text, answer_text, ai_score, ai_feedback, corrected_answer 
-        FROM answers 
-        WHERE interview_id = ? 
-        ORDER BY question_id ASC
-    """, (interview_id,))
-    answers = cursor.fetchall()
+    answers = repository.report_answers.blocking(interview_id)
     
     # Generate PDF
     pdf_filename = f"Interview_Report_{interview_id}.pdf"
@@ -1113,8 +1421,6 @@ def generate_report(interview_id: str):
 # ADMIN & SESSION MANAGEMENT APIs
 # --------------------------------------------------------------------------------
 
-import hashlib
-
 class AdminLogin(BaseModel):
     username: str
     password: str
@@ -1124,31 +1430,77 @@ class CreateSession(BaseModel):
     resume_text: str
     job_description: str
     admin_id: int
+    evaluation_mode: str = "per_answer"  # or "batch" (score everything at the end)
 
 def hash_password(password: str) -> str:
     return hashlib.sha256(password.encode()).hexdigest()
 
+# Background pre-computation of profile analysis + questions for admin-created sessions
+PRECOMPUTE_CONCURRENCY = int(os.getenv("PRECOMPUTE_CONCURRENCY", "2"))
+# How long a candidate starting the interview waits on a precompute still in flight
+PRECOMPUTE_WAIT_SECONDS = float(os.getenv("PRECOMPUTE_WAIT_SECONDS", "60"))
+precompute_queue = JobQueue("session-precompute", concurrency=PRECOMPUTE_CONCURRENCY)
+
+def session_source(resume_text: str, job_description: str):
+    """Pick what a session interview is based on: JD if exists, else Resume."""
+    source = "job_description" if job_description and len(job_description) > 50 else "resume"
+    content_str = job_description if source == "job_description" else resume_text
+    return source, content_str
+
+async def precompute_session(link_id: str):
+    session = await repository.get_session(link_id)
+    if not session:
+        return
+
+    await repository.set_precompute_status(link_id, "running")
+
+    try:
+        source, content_str = session_source(session["resume_text"], session["job_description"])
+        profile_analysis, questions, pending_analysis = await prepare_interview(content_str, source)
+        if pending_analysis:
+            # Nobody is waiting on a spinner here, so let the analysis finish.
+            profile_analysis = await pending_analysis
+
+        await repository.save_precomputed(link_id, source, profile_analysis, questions)
+        print(f"✅ Session {link_id} precomputed ({len(questions)} questions)")
+    except Exception:
+        await repository.set_precompute_status(link_id, "failed")
+        raise
+
+async def queue_session_precompute(link_id: str):
+    await repository.set_precompute_status(link_id, "queued")
+    precompute_queue.submit(precompute_session, link_id, job_id=link_id)
+
 @app.on_event("startup")
 def startup_event():
     # Create default admin if not exists
     try:
-        cursor.execute("SELECT * FROM admins WHERE username = ?", ("admin",))
-        if not cursor.fetchone():
-            hashed_pw = hash_password("admin123")
-            cursor.execute(
-                "INSERT INTO admins (username, password, created_at) VALUES (?, ?, ?)",
-                ("admin", hashed_pw, datetime.now().isoformat())
-            )
-            conn.commit()
+        if repository.ensure_admin.blocking("admin", hash_password("admin123")):
             print("Default admin created: admin / admin123")
     except Exception as e:
         print(f"Error checking/creating admin: {e}")
 
+@app.on_event("startup")
+def warm_up_transcription():
+    # Opt-in: start the workers (and load their models) in the background so startup itself stays fast
+    if WHISPER_WARMUP:
+        threading.Thread(target=transcription_pool.warm_up, name="whisper-warmup", daemon=True).start()
+
+@app.on_event("startup")
+async def resume_session_precompute():
+    # Jobs that were queued/running when the server stopped are lost with the process
+    for link_id in await repository.sessions_to_precompute():
+        await queue_session_precompute(link_id)
+
+@app.on_event("startup")
+async def resume_answer_scoring():
+    for answer_id, interview_id, question_id, question_text, answer_text in await repository.pending_answers():
+        queue_answer_scoring(answer_id, interview_id, question_id, question_text, answer_text, await interview_context(interview_id))
+
 @app.post("/admin/login")
 async def admin_login(data: AdminLogin):
     hashed_pw = hash_password(data.password)
-    cursor.execute("SELECT id, username FROM admins WHERE username = ? AND password = ?", (data.username, hashed_pw))
-    user = cursor.fetchone()
+    user = await repository.find_admin(data.username, hashed_pw)
     if user:
         return {"status": "success", "admin_id": user[0], "username": user[1]}
     else:
@@ -1160,53 +1512,77 @@ async def parse_resume(file: UploadFile = File(...)):
     text = extract_text_from_file(content, file.filename)
     return {"status": "success", "text": text}
 
+@app.get("/admin/cache/stats")
+async def llm_cache_stats():
+    llm_stats, transcript_stats = await asyncio.gather(run_db(llm_cache.stats), run_db(transcript_cache.stats))
+    return {"status": "success", "llm_cache": llm_stats, "transcript_cache": transcript_stats}
+
+@app.post("/admin/cache/purge")
+async def purge_llm_cache():
+    removed = await run_db(llm_cache.purge) + await run_db(transcript_cache.purge)
+    print(f"🧹 LLM + transcript caches purged ({removed} entries)")
+    return {"status": "success", "removed": removed}
+
 @app.post("/admin/create-session")
 async def create_session(data: CreateSession):
+    if data.evaluation_mode not in EVALUATION_MODES:
+        raise HTTPException(status_code=400, detail=f"evaluation_mode must be one of {EVALUATION_MODES}")
     link_id = str(uuid.uuid4())
-    cursor.execute(
-        """INSERT INTO interview_sessions 
-           (link_id, candidate_name, resume_text, job_description, created_by, created_at) 
-           VALUES (?, ?, ?, ?, ?, ?)""",
-        (link_id, data.candidate_name, data.resume_text, data.job_description, data.admin_id, datetime.now().isoformat())
+    await repository.create_session(
+        link_id, data.candidate_name, data.resume_text, data.job_description, data.evaluation_mode, data.admin_id
     )
-    conn.commit()
+    # Do the expensive LLM work now, before the candidate clicks the link
+    await queue_session_precompute(link_id)
     # Assuming the frontend is served at the root or configured domain
     return {"status": "success", "link_id": link_id, "link_url": f"?session_id={link_id}"}
 
 @app.get("/session/{link_id}")
 async def get_session(link_id: str):
-    cursor.execute("SELECT candidate_name, resume_text, job_description, status FROM interview_sessions WHERE link_id = ?", (link_id,))
-    row = cursor.fetchone()
-    if row:
+    session = await repository.get_session(link_id)
+    if session:
+        job = precompute_queue.get(link_id)
         return {
             "status": "success",
-            "candidate_name": row[0],
-            "resume_text": row[1],
-            "job_description": row[2],
-            "session_status": row[3]
+            "candidate_name": session["candidate_name"],
+            "resume_text": session["resume_text"],
+            "job_description": session["job_description"],
+            "session_status": session["status"],
+            "precompute_status": session["precompute_status"] or "none",
+            "precompute_error": job["error"] if job else None
         }
     else:
         raise HTTPException(status_code=404, detail="Session not found")
 
 @app.post("/start-session-interview")
-async def start_session_interview(link_id: str = Form(...)):
-    cursor.execute("SELECT candidate_name, resume_text, job_description, status FROM interview_sessions WHERE link_id = ?", (link_id,))
-    row = cursor.fetchone()
+async def start_session_interview(link_id: str = Form(...), defer_analysis: bool = Form(False)):
+    session = await repository.get_session(link_id)
     
-    if not row:
+    if not session:
         raise HTTPException(status_code=404, detail="Session not found")
         
-    candidate_name, resume_text, job_description, status = row
+    candidate_name, resume_text, job_description = session["candidate_name"], session["resume_text"], session["job_description"]
+    evaluation_mode = session["evaluation_mode"] or "per_answer"
     
     # Generate Questions
     # source priority: JD if exists, else Resume
-    source = "job_description" if job_description and len(job_description) > 50 else "resume"
-    content_str = job_description if source == "job_description" else resume_text
+    source, content_str = session_source(resume_text, job_description)
+
+    job = precompute_queue.get(link_id)
+    if job and job["status"] in ("queued", "running"):
+        # The link was opened before its precompute finished: join that job rather than redo its LLM work
+        print(f"⏳ Waiting for precompute of session {link_id}...")
+        await precompute_queue.wait(link_id, timeout=PRECOMPUTE_WAIT_SECONDS)
+        session = await repository.get_session(link_id)
     
-    # We also want to analyze the profile
-    profile_analysis = analyze_resume_or_jd(content_str)
-    
-    questions = generate_mock_questions(content_str, source)
+    if session["precompute_status"] == "ready" and session["precomputed_questions"]:
+        # Pre-generated when the admin created the link: no LLM call needed
+        source = session["precomputed_source"] or source
+        profile_analysis = session["precomputed_analysis"]
+        questions = session["precomputed_questions"]
+        pending_analysis = None
+    else:
+        # We also want to analyze the profile (concurrently with question generation)
+        profile_analysis, questions, pending_analysis = await prepare_interview(content_str, source, defer_analysis)
     
     if not questions:
         raise HTTPException(status_code=400, detail="Failed to generate questions")
@@ -1214,41 +1590,26 @@ async def start_session_interview(link_id: str = Form(...)):
     interview_id = f"int_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}"
 
     # Store interview data (RAM)
-    interviews[interview_id] = {
-        "id": interview_id,
-        "source": source,
-        "profile_text": content_str[:5000],
-        "profile_analysis": profile_analysis,
-        "questions": questions,
-        "answers": {},
-        "created_at": datetime.now().isoformat(),
-        "candidate_name": candidate_name
-    }
+    new_session(interview_id, source, content_str[:5000], profile_analysis, evaluation_mode, candidate_name)
     
-    # Store interview data (DB)
+    # Store interview data and mark the session started (DB)
     try:
-        cursor.execute("""
-            INSERT INTO interviews (id, source, profile_text, questions, created_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            interview_id, 
-            source, 
-            content_str[:5000], 
-            json.dumps(questions), 
-            datetime.now().isoformat()
-        ))
-        
-        # Update session status
-        cursor.execute("UPDATE interview_sessions SET status = 'started' WHERE link_id = ?", (link_id,))
-        conn.commit()
+        await repository.start_session(
+            link_id, interview_id, source, content_str[:5000], profile_analysis, questions, evaluation_mode, candidate_name
+        )
     except Exception as db_e:
         print(f"⚠️ DB Save Error: {db_e}")
+
+    if pending_analysis:
+        schedule_profile_analysis(interview_id, pending_analysis)
         
     return {
         "interview_id": interview_id,
         "total_questions": len(questions),
         "first_question": questions[0],
-        "candidate_name": candidate_name
+        "candidate_name": candidate_name,
+        "evaluation_mode": evaluation_mode,
+        "profile_analysis_ready": pending_analysis is None
     }
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+import os
+
+# 🔹 Energy-based voice activity detection. Answer recordings carry long
+# leading/trailing silence and pauses; cutting those out before Whisper means
+# the model only spends compute on speech. SpeechMap maps timestamps on the
+# trimmed audio back to the original recording.
+SAMPLE_RATE = 16000
+VAD_FRAME_MS = 30
+VAD_MARGIN_DB = float(os.getenv("VAD_MARGIN_DB", "10"))     # speech = this much above the noise floor
+VAD_MIN_DB = float(os.getenv("VAD_MIN_DB", "-50"))          # ...and never quieter than this (dBFS)
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "200"))
+VAD_MIN_SILENCE_MS = int(os.getenv("VAD_MIN_SILENCE_MS", "500"))  # shorter pauses stay in
+VAD_PAD_MS = int(os.getenv("VAD_PAD_MS", "200"))
+
+
+def frame_energies_db(samples, frame: int):
+    import numpy as np
+    count = len(samples) // frame
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[:count * frame].reshape(count, frame)
+    rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def detect_speech(samples, sample_rate: int = SAMPLE_RATE):
+    """Return [(start_sample, end_sample)] regions that contain speech."""
+    import numpy as np
+    frame = sample_rate * VAD_FRAME_MS // 1000
+    energies = frame_energies_db(samples, frame)
+    if len(energies) == 0:
+        return []
+
+    noise_floor = float(np.percentile(energies, 10))
+    if float(np.percentile(energies, 90)) - noise_floor < VAD_MARGIN_DB:
+        # Flat level throughout (no pauses at all, or silence only): there is no
+        # noise floor to measure against, so only the absolute minimum applies
+        voiced = energies > VAD_MIN_DB
+    else:
+        voiced = energies > max(noise_floor + VAD_MARGIN_DB, VAD_MIN_DB)
+
+    # Runs of voiced frames -> regions, in frames
+    regions = []
+    start = None
+    for i, is_voiced in enumerate(voiced):
+        if is_voiced and start is None:
+            start = i
+        elif not is_voiced and start is not None:
+            regions.append([start, i])
+            start = None
+    if start is not None:
+        regions.append([start, len(voiced)])
+
+    # Bridge short pauses, then drop blips too short to be words
+    min_silence = VAD_MIN_SILENCE_MS // VAD_FRAME_MS
+    merged = []
+    for region in regions:
+        if merged and region[0] - merged[-1][1] < min_silence:
+            merged[-1][1] = region[1]
+        else:
+            merged.append(region)
+    min_speech = VAD_MIN_SPEECH_MS // VAD_FRAME_MS
+    merged = [r for r in merged if r[1] - r[0] >= min_speech]
+
+    pad = sample_rate * VAD_PAD_MS // 1000
+    speech = []
+    for start_frame, end_frame in merged:
+        start_sample = max(0, start_frame * frame - pad)
+        end_sample = min(len(samples), end_frame * frame + pad)
+        if speech and start_sample <= speech[-1][1]:
+            speech[-1] = (speech[-1][0], end_sample)
+        else:
+            speech.append((start_sample, end_sample))
+    return speech
+
+
+class SpeechMap:
+    """Where each stretch of the trimmed audio came from in the original."""
+
+    def __init__(self, regions, total_samples: int, sample_rate: int = SAMPLE_RATE):
+        self.regions = regions
+        self.total_samples = total_samples
+        self.sample_rate = sample_rate
+
+    @property
+    def audio_seconds(self) -> float:
+        return self.total_samples / self.sample_rate
+
+    @property
+    def speech_seconds(self) -> float:
+        return sum(end - start for start, end in self.regions) / self.sample_rate
+
+    def to_original(self, seconds: float) -> float:
+        """Map a timestamp on the trimmed audio back onto the original recording."""
+        remaining = seconds * self.sample_rate
+        for start, end in self.regions:
+            length = end - start
+            if remaining <= length:
+                return (start + remaining) / self.sample_rate
+            remaining -= length
+        return self.regions[-1][1] / self.sample_rate if self.regions else 0.0
+
+    def remap(self, result: dict) -> dict:
+        segments = [
+            {**s, "start": round(self.to_original(s["start"]), 3), "end": round(self.to_original(s["end"]), 3)}
+            for s in result.get("segments", [])
+        ]
+        return {
+            **result,
+            "segments": segments,
+            "duration": self.audio_seconds,
+            "speech_seconds": round(self.speech_seconds, 3)
+        }
+
+
+def trim_silence(samples, sample_rate: int = SAMPLE_RATE):
+    """Return (speech_only_samples, SpeechMap)."""
+    import numpy as np
+    regions = detect_speech(samples, sample_rate)
+    speech_map = SpeechMap(regions, len(samples), sample_rate)
+    if not regions:
+        return samples[:0], speech_map
+    return np.concatenate([samples[start:end] for start, end in regions]), speech_map
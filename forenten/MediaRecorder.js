@@ -51,6 +51,8 @@ class VideoRecorder {
                 if (finalChunk) {
                     this.transcriptionBox.value += finalChunk + ' ';
                     this.transcriptionBox.scrollTop = this.transcriptionBox.scrollHeight;
+                    // Let the server start on the follow-up while the candidate keeps talking
+                    if (window.speculateNextQuestion) window.speculateNextQuestion(this.transcriptionBox.value);
                 }
 
                 // 2. Update the STATUS DIV with interim text
@@ -273,6 +275,9 @@ class VideoRecorder {
             console.warn("Backend returned no speech, keeping live text.");
         }
 
+        // Final text (Whisper, or the live text kept above) goes out right away, not on a timer
+        if (window.speculateNextQuestion) window.speculateNextQuestion(this.transcriptionBox.value, true);
+
         this.transcriptionDisplay.textContent = "Processing complete.";
 
         this.showStatus('Answer transcribed successfully', 'success');